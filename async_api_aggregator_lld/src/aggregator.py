@@ -1,25 +1,166 @@
 import asyncio
 import logging
 import random
-from typing import List, Dict, Any
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
+
+try:
+    import aiohttp
+except ImportError:  # Optional: only needed when services have real URLs configured.
+    aiohttp = None
 
 # Configure professional logging to provide insight into the process.
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
+# The format above never prints thread/process info, so skip collecting it
+# for every log record. Log calls below pass arguments lazily (%-style) so
+# messages are only formatted when the level is enabled.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+class ResponseCache:
+    """
+    A TTL + LRU cache for downstream responses with in-flight deduplication.
+
+    Concurrent misses for the same key share a single downstream call: the
+    first caller starts the fetch and everyone else awaits the same task.
+    Failures are never cached, so the next request retries the service.
+    """
+    def __init__(self, ttl: float = 30.0, max_entries: int = 10_000):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    async def get_or_fetch(self, key: Tuple[str, str],
+                           fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fill(key, fetch))
+            self._inflight[key] = task
+        # Shield so one caller timing out does not cancel the fetch for the others.
+        return await asyncio.shield(task)
+
+    async def _fill(self, key: Tuple[str, str],
+                    fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        try:
+            value = await fetch()
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+# Aggregators are created per request, so the cache must outlive them to be useful.
+_shared_cache = ResponseCache()
+
+# One process-wide HTTP session so TCP/TLS connections are pooled and reused
+# across requests instead of being dialed fresh for every downstream call.
+_session: Optional["aiohttp.ClientSession"] = None
+
+
+async def get_session() -> "aiohttp.ClientSession":
+    """Returns the shared HTTP session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required to call real downstream services.")
+        connector = aiohttp.TCPConnector(
+            limit=100, limit_per_host=10, ttl_dns_cache=300, enable_cleanup_closed=True
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=1.5, connect=0.5, sock_read=1.0),
+        )
+    return _session
+
+
+def enable_eager_tasks(loop: Optional[asyncio.AbstractEventLoop] = None) -> bool:
+    """
+    Installs `asyncio.eager_task_factory` (Python 3.12+) on the event loop.
+
+    With eager tasks, `create_task` runs each fetch synchronously up to its
+    first real suspension point, so fan-out calls answered from the cache
+    complete without a round-trip through the event loop. Call once at
+    application startup. Returns False when the running Python lacks support.
+    """
+    factory = getattr(asyncio, "eager_task_factory", None)
+    if factory is None:
+        return False
+    loop = loop or asyncio.get_running_loop()
+    loop.set_task_factory(factory)
+    return True
+
+
+async def close_session() -> None:
+    """Closes the shared HTTP session. Call once at application shutdown."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
 
 class Aggregator:
     """
     Handles a single request to fetch and aggregate data from multiple
     downstream services concurrently, with resilience and timeouts.
     """
-    def __init__(self, user_id: str, fanout_services: List[str]):
+    def __init__(self, user_id: str, fanout_services: List[str],
+                 cache: Optional[ResponseCache] = None,
+                 service_urls: Optional[Dict[str, str]] = None,
+                 session: Optional["aiohttp.ClientSession"] = None):
         self.user_id = user_id
         self.fanout_services = fanout_services
-        logging.info(f"Aggregator created for user '{self.user_id}' with services: {self.fanout_services}")
+        self.cache = cache if cache is not None else _shared_cache
+        # URL templates per service, e.g. {"users": "http://users/users/{user_id}"}.
+        # Services without a URL fall back to the simulated call.
+        self.service_urls = service_urls or {}
+        self.session = session
+        logging.info("Aggregator created for user '%s' with services: %s", self.user_id, self.fanout_services)
 
     async def fetch_data(self, service: str) -> Dict[str, Any]:
+        """
+        Fetches data for this user from a downstream service, serving repeat
+        requests from the cache and coalescing concurrent identical requests.
+        """
+        return await self.cache.get_or_fetch(
+            (self.user_id, service), lambda: self._call_service(service))
+
+    @staticmethod
+    async def shutdown() -> None:
+        """Releases the pooled HTTP connections shared by all aggregators."""
+        await close_session()
+
+    async def _call_service(self, service: str) -> Dict[str, Any]:
+        """
+        Makes the API call to a downstream service over the pooled session,
+        or simulates it when no URL is configured for the service.
+        """
+        url = self.service_urls.get(service)
+        if url is None:
+            return await self._simulate_call(service)
+
+        session = self.session or await get_session()
+        async with session.get(url.format(user_id=self.user_id)) as resp:
+            resp.raise_for_status()
+            return await resp.json()
+
+    async def _simulate_call(self, service: str) -> Dict[str, Any]:
         """
         Simulates making a real API call to a downstream service.
         Includes variable latency and a chance of failure to test resilience.
@@ -32,64 +173,99 @@ class Aggregator:
         if "orders" in service and random.random() < 0.3: # 30% chance of failure
             raise ConnectionError(f"Could not connect to {service}")
 
-        logging.info(f"Successfully fetched data from {service} in {delay:.2f}s")
+        logging.info("Successfully fetched data from %s in %.2fs", service, delay)
         return {"service": service, "user_id": self.user_id, "data": f"some_data_from_{service}"}
 
-    async def aggregate(self, timeout: float = 1.5) -> Dict[str, Any]:
+    async def _fetch_with_timeout(self, service: str, timeout: float) -> Tuple[str, Any]:
+        """
+        Fetches a single service under its own deadline.
+
+        Never raises: failures and per-service timeouts are returned as the
+        result so that one bad service cannot cancel its siblings in the
+        surrounding `TaskGroup`.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                return service, await self.fetch_data(service)
+        except Exception as e:
+            return service, e
+
+    @staticmethod
+    def _collect(final_response: Dict[str, Any], service_name: str, result: Any) -> bool:
+        """
+        Records one service's outcome, separating successful data from
+        failures. Returns True if the service failed.
+        """
+        if isinstance(result, Exception):
+            # For an actual service, log the full exception for debugging.
+            logging.error("Service '%s' failed: %r", service_name, result)
+            # For the client, return a clean, serializable error message.
+            final_response[service_name] = {"error": f"Failed to fetch data from {service_name}."}
+            return True
+        # The result was successful.
+        final_response[service_name] = result
+        return False
+
+    async def aggregate(self, timeout: float = 1.5,
+                        per_service_timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Orchestrates the concurrent fetching and aggregation of data.
 
         This method implements the core patterns for a resilient service:
-        1. Creates concurrent tasks for all service calls.
-        2. Wraps the entire operation in a timeout (`asyncio.wait_for`).
-        3. Gathers results, treating exceptions as results (`return_exceptions=True`).
-        4. Inspects the results to build a final, clean JSON-friendly response,
-           providing partial data in case of individual service failures.
+        1. Creates concurrent tasks for all service calls inside a `TaskGroup`.
+        2. Gives each call its own deadline (`asyncio.timeout`), so a slow
+           service is cancelled individually while the others continue.
+        3. Wraps the entire operation in a global timeout; on expiry the
+           `TaskGroup` cancels whatever is still running.
+        4. Consumes results as they complete (`asyncio.as_completed`) to build
+           a final, clean JSON-friendly response, providing partial data in
+           case of individual service failures.
 
         Args:
             timeout: The overall deadline in seconds for the aggregation.
+            per_service_timeout: The deadline for each individual service call.
+                Defaults to the overall deadline.
 
         Returns:
             A dictionary containing the aggregated data and/or error messages.
         """
-        tasks = [asyncio.create_task(self.fetch_data(service))
-                 for service in self.fanout_services]
+        if per_service_timeout is None:
+            per_service_timeout = timeout
+
+        final_response: Dict[str, Any] = {}
+        has_errors = False
 
         try:
-            # 1. `asyncio.wait_for` enforces the overall SLO/deadline.
-            # 2. `asyncio.gather` runs all tasks concurrently.
-            # 3. `return_exceptions=True` is CRITICAL. It ensures that one
-            #    failed task does not crash the entire operation.
-            results = await asyncio.wait_for(
-                asyncio.gather(*tasks, return_exceptions=True),
-                timeout=timeout
-            )
-
-            final_response: Dict[str, Any] = {}
-            has_errors = False
-
-            # This loop is the final, crucial step. It inspects the results
-            # to build a clean response, separating successful data from failures.
-            for service_name, result in zip(self.fanout_services, results):
-                if isinstance(result, Exception):
-                    has_errors = True
-                    # For an actual service, log the full exception for debugging.
-                    logging.error(f"Service '{service_name}' failed: {result}")
-                    # For the client, return a clean, serializable error message.
-                    final_response[service_name] = {"error": f"Failed to fetch data from {service_name}."}
-                else:
-                    # The result was successful.
-                    final_response[service_name] = result
+            # 1. The outer `asyncio.timeout` enforces the overall SLO/deadline.
+            async with asyncio.timeout(timeout):
+                if len(self.fanout_services) == 1:
+                    # Nothing to fan out: await the single call directly and
+                    # skip the Task/TaskGroup machinery.
+                    service_name, result = await self._fetch_with_timeout(
+                        self.fanout_services[0], per_service_timeout)
+                    has_errors = self._collect(final_response, service_name, result)
+                elif self.fanout_services:
+                    # 2. The `TaskGroup` owns the tasks and cancels them if we leave early.
+                    async with asyncio.TaskGroup() as tg:
+                        tasks = [tg.create_task(self._fetch_with_timeout(service, per_service_timeout))
+                                 for service in self.fanout_services]
+
+                        # 3. Results are materialized as soon as each service answers.
+                        for next_done in asyncio.as_completed(tasks):
+                            service_name, result = await next_done
+                            has_errors |= self._collect(final_response, service_name, result)
 
             return {
                 "status": "partial_success" if has_errors else "success",
                 "data": final_response
             }
 
-        except asyncio.TimeoutError:
-            logging.error(f"Global timeout of {timeout}s exceeded.")
-            # On timeout, it's best practice to cancel the lingering tasks
-            # to free up resources immediately.
-            for task in tasks:
-                task.cancel()
-            return {"status": "timeout", "error": f"Request timed out after {timeout}s."}
\ No newline at end of file
+        except TimeoutError:
+            logging.error("Global timeout of %ss exceeded.", timeout)
+            # Lingering tasks were already cancelled by the TaskGroup. Whatever
+            # completed before the deadline is still returned to the caller.
+            return {
+                "status": "timeout",
+                "error": f"Request timed out after {timeout}s.",
+                "data": final_response
+            }
@@ -1,17 +1,51 @@
+from __future__ import annotations
+from collections import deque
+from functools import cached_property
+from typing import Iterable, Iterator
+
 from models import Move
 
 class AuditLog:
-    """A simple, immutable audit log to record game history, similar to a transaction log."""
-    def __init__(self, moves: list[Move] | None = None):
-        self._moves: tuple[Move, ...] = tuple(moves) if moves else tuple()
+    """A simple, immutable audit log to record game history, similar to a transaction log.
+
+    Internally a persistent linked list: each log holds its newest move and a
+    reference to the previous log, so appending shares the existing history
+    instead of copying it.
+    """
+    def __init__(self, head: Move | None = None, tail: AuditLog | None = None, length: int = 0):
+        self._head = head
+        self._tail = tail
+        self._len = length
+
+    @classmethod
+    def from_iterable(cls, moves: Iterable[Move]) -> AuditLog:
+        """Builds an AuditLog from an ordered sequence of moves."""
+        log = cls()
+        for move in moves:
+            log = log.add_move(move)
+        return log
 
-    def add_move(self, move: Move) -> 'AuditLog':
-        """Returns a new AuditLog instance with the added move."""
-        return AuditLog(list(self._moves) + [move])
+    def add_move(self, move: Move) -> AuditLog:
+        """Returns a new AuditLog instance with the added move. O(1)."""
+        return AuditLog(head=move, tail=self, length=self._len + 1)
 
-    @property
+    def _iter_newest_first(self) -> Iterator[Move]:
+        node: AuditLog | None = self
+        while node is not None and node._head is not None:
+            yield node._head
+            node = node._tail
+
+    @cached_property
     def history(self) -> tuple[Move, ...]:
-        return self._moves
+        moves = list(self._iter_newest_first())
+        moves.reverse()
+        return tuple(moves)
+
+    def __len__(self) -> int:
+        return self._len
 
     def __str__(self) -> str:
-        return "\n".join(f"{i+1}. {move}" for i, move in enumerate(self._moves))
+        moves: deque[Move] = deque()
+        for move in self._iter_newest_first():
+            moves.appendleft(move)
+        return "\n".join(f"{i+1}. {move}" for i, move in enumerate(moves))
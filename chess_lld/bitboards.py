@@ -0,0 +1,85 @@
+"""Precomputed 64-bit attack tables for move generation.
+
+Square indices match Position.index (row * 8 + col), so bit `i` of a mask
+is the square Position.from_index(i). Jump pieces (knight, king) use a
+direct per-square lookup; sliding pieces use per-direction ray tables cut
+at the first blocker, so move generation is a handful of int operations
+instead of a Python loop over squares.
+"""
+from typing import Iterator
+
+Direction = tuple[int, int]
+
+FULL_MASK = (1 << 64) - 1
+
+_KNIGHT_OFFSETS: tuple[Direction, ...] = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+_KING_OFFSETS: tuple[Direction, ...] = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+
+# (row step, col step) per sliding direction. Directions that increase the
+# square index scan for the lowest blocker, the others for the highest.
+ROOK_DIRECTIONS: tuple[Direction, ...] = ((1, 0), (0, 1), (-1, 0), (0, -1))
+BISHOP_DIRECTIONS: tuple[Direction, ...] = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def _jump_attacks(square: int, offsets: tuple[Direction, ...]) -> int:
+    row, col = divmod(square, 8)
+    mask = 0
+    for d_row, d_col in offsets:
+        r, c = row + d_row, col + d_col
+        if 0 <= r < 8 and 0 <= c < 8:
+            mask |= 1 << (r * 8 + c)
+    return mask
+
+
+def _ray(square: int, d_row: int, d_col: int) -> int:
+    row, col = divmod(square, 8)
+    mask = 0
+    r, c = row + d_row, col + d_col
+    while 0 <= r < 8 and 0 <= c < 8:
+        mask |= 1 << (r * 8 + c)
+        r, c = r + d_row, c + d_col
+    return mask
+
+
+KNIGHT_ATTACKS: list[int] = [_jump_attacks(sq, _KNIGHT_OFFSETS) for sq in range(64)]
+KING_ATTACKS: list[int] = [_jump_attacks(sq, _KING_OFFSETS) for sq in range(64)]
+RAYS: dict[Direction, list[int]] = {
+    direction: [_ray(sq, *direction) for sq in range(64)]
+    for direction in ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+}
+
+
+def _sliding_attacks(square: int, occupied: int, directions: tuple[Direction, ...]) -> int:
+    attacks = 0
+    for direction in directions:
+        ray = RAYS[direction][square]
+        blockers = ray & occupied
+        if blockers:
+            if direction[0] * 8 + direction[1] > 0:
+                first = (blockers & -blockers).bit_length() - 1
+            else:
+                first = blockers.bit_length() - 1
+            # Keep the blocker itself (a potential capture), drop what lies beyond it.
+            ray ^= RAYS[direction][first]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    return _sliding_attacks(square, occupied, ROOK_DIRECTIONS)
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    return _sliding_attacks(square, occupied, BISHOP_DIRECTIONS)
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+def iter_squares(mask: int) -> Iterator[int]:
+    """Yields the index of every set bit, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -1,40 +1,125 @@
 from __future__ import annotations
-import copy
+from typing import NamedTuple
 
 from models import Position, Move, Color
-from pieces import Piece, Rook, Knight, Bishop, Queen, King, Pawn
+from pieces import Piece, WHITE_PAWN, BLACK_PAWN
+
+BOARD_SQUARES = 64
+
+# Everything needed to revert an in-place move: square indices, the piece
+# that moved, whatever previously occupied the destination and the prior
+# occupancy bitboards.
+class UndoRecord(NamedTuple):
+    start: int
+    end: int
+    moved: Piece | None
+    captured: Piece | None
+    white: int
+    black: int
 
 class Board:
     """Manages the state of the 8x8 grid. This class is immutable.
     Operations that change the board return a new Board instance.
+
+    The grid is stored as a flat list of 64 slots indexed by Position.index
+    (row * 8 + col), so lookups are a single list index and copies are a
+    C-level slice rather than a dict rehash. Alongside it the board keeps one
+    64-bit occupancy bitboard per color for move generation (see bitboards.py).
     """
-    def __init__(self, board_state: dict[Position, Piece] | None = None):
-        self._board: dict[Position, Piece] = board_state if board_state is not None else self._setup_new_board()
+    def __init__(self, board_state: list[Piece | None] | None = None,
+                 occupancy: tuple[int, int] | None = None):
+        self._board: list[Piece | None] = board_state if board_state is not None else self._setup_new_board()
+        if occupancy is None:
+            occupancy = self._compute_occupancy(self._board)
+        self._white, self._black = occupancy
 
     def get_piece_at(self, position: Position) -> Piece | None:
-        return self._board.get(position)
+        return self._board[position.index]
+
+    def color_mask(self, color: Color) -> int:
+        """Bitboard of the squares occupied by the given color."""
+        return self._white if color == Color.WHITE else self._black
+
+    @property
+    def occupied(self) -> int:
+        """Bitboard of all occupied squares."""
+        return self._white | self._black
 
     def apply_move(self, move: Move) -> Board:
         """Applies a move and returns a new Board object with the updated state."""
-        new_board_state = self._board.copy()
-        piece = new_board_state.pop(move.start_pos)
-        new_board_state[move.end_pos] = piece
+        new_board_state = self._board[:]
+        start, end = move.start_pos.index, move.end_pos.index
+        new_board_state[end] = new_board_state[start]
+        new_board_state[start] = None
         # Handle captures, castling, etc.
-        return Board(new_board_state)
+        return Board(new_board_state, self._moved_occupancy(new_board_state[end], start, end))
+
+    def apply_move_inplace(self, move: Move) -> UndoRecord:
+        """Make/unmake support for search and validation.
+
+        Mutates this board and returns an UndoRecord that must be passed to
+        unmake_move to restore it. Only use on a board that is not shared with
+        other threads; the committed game state goes through apply_move.
+        """
+        board = self._board
+        start, end = move.start_pos.index, move.end_pos.index
+        undo = UndoRecord(start, end, board[start], board[end], self._white, self._black)
+        board[end] = board[start]
+        board[start] = None
+        self._white, self._black = self._moved_occupancy(board[end], start, end)
+        return undo
+
+    def load_from(self, other: Board) -> None:
+        """Overwrites this board with other's position, reusing its storage.
+
+        For private scratch boards: copy the shared board in, then probe it
+        with apply_move_inplace without touching the shared one.
+        """
+        self._board[:] = other._board
+        self._white, self._black = other._white, other._black
+
+    def unmake_move(self, undo: UndoRecord) -> None:
+        """Reverts a move previously made with apply_move_inplace."""
+        self._board[undo.start] = undo.moved
+        self._board[undo.end] = undo.captured
+        self._white, self._black = undo.white, undo.black
+
+    def _moved_occupancy(self, moved: Piece | None, start: int, end: int) -> tuple[int, int]:
+        """Occupancy after moving `moved` from start to end (capturing anything on end)."""
+        start_bit, end_bit = 1 << start, 1 << end
+        white = self._white & ~start_bit & ~end_bit
+        black = self._black & ~start_bit & ~end_bit
+        if moved is not None:
+            if moved.color == Color.WHITE:
+                white |= end_bit
+            else:
+                black |= end_bit
+        return white, black
+
+    @staticmethod
+    def _compute_occupancy(board: list[Piece | None]) -> tuple[int, int]:
+        white = black = 0
+        for index, piece in enumerate(board):
+            if piece is None:
+                continue
+            if piece.color == Color.WHITE:
+                white |= 1 << index
+            else:
+                black |= 1 << index
+        return white, black
 
-    def _setup_new_board(self) -> dict[Position, Piece]:
+    def _setup_new_board(self) -> list[Piece | None]:
         """Returns the standard starting layout of a chess board."""
-        pieces = {}
+        pieces: list[Piece | None] = [None] * BOARD_SQUARES
         # Place white and black pieces
         for i in range(8):
-            pieces[Position(1, i)] = Pawn(Color.WHITE)
-            pieces[Position(6, i)] = Pawn(Color.BLACK)
+            pieces[Position(1, i).index] = WHITE_PAWN
+            pieces[Position(6, i).index] = BLACK_PAWN
         # ... and so on for other pieces (Rooks, Knights, etc.)
         return pieces
 
     def __str__(self) -> str:
         # A simple text representation of the board
-        grid = [["." for _ in range(8)] for _ in range(8)]
-        for pos, piece in self._board.items():
-            grid[pos.row][pos.col] = str(piece)
-        return "\n".join("".join(row) for row in reversed(grid))
+        cells = ["." if piece is None else str(piece) for piece in self._board]
+        rows = ["".join(cells[row * 8:row * 8 + 8]) for row in range(8)]
+        return "\n".join(reversed(rows))
@@ -5,7 +5,7 @@ from audit import AuditLog
 
 class Game:
     """The main orchestrator for the chess game."""
-    def __init__(self):
+    def __init__(self) -> None:
         self._board = Board()
         self._rule_engine = RuleEngine()
         self._audit_log = AuditLog()
@@ -1,6 +1,10 @@
+from __future__ import annotations
 from enum import Enum, auto
-from dataclasses import dataclass
-from pieces import Piece
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pieces import Piece
 
 
 class Color(Enum):
@@ -8,17 +12,30 @@ class Color(Enum):
     BLACK = auto()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Position:
     """Represents a position on the board. Immutable."""
     row: int
     col: int
+    # Flat board index (row * 8 + col), computed once since Position is immutable.
+    index: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "index", self.row * 8 + self.col)
+
+    def __hash__(self) -> int:
+        # The flat index is already a unique int per on-board square.
+        return self.index
+
+    @classmethod
+    def from_index(cls, index: int) -> Position:
+        return cls(index // 8, index % 8)
 
     def is_valid(self) -> bool:
         return 0 <= self.row < 8 and 0 <= self.col < 8
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Move:
     """Represents a move. Immutable value object."""
     start_pos: Position
@@ -27,3 +44,11 @@ class Move:
     captured_piece: Piece | None = None
     is_castling: bool = False
     is_en_passant: bool = False
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Pieces are shared flyweights compared by identity, so id() is stable.
+        object.__setattr__(self, "_hash", hash((self.start_pos.index, self.end_pos.index, id(self.piece))))
+
+    def __hash__(self) -> int:
+        return self._hash
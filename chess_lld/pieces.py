@@ -1,17 +1,30 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from models import Color, Position, Move
+from bitboards import (
+    KNIGHT_ATTACKS, KING_ATTACKS, bishop_attacks, iter_squares, queen_attacks, rook_attacks,
+)
 
-# Forward declaration for type hinting
-class Board:
-    pass
+if TYPE_CHECKING:
+    from board import Board
 
-@dataclass
+@dataclass(eq=False)
 class Piece(ABC):
-    """Abstract Base Class for all pieces."""
+    """Abstract Base Class for all pieces.
+
+    Pieces carry no per-square state, so the board shares the flyweight
+    instances defined at the bottom of this module; equality is identity.
+    """
     color: Color
+    # Upper-case symbol for the white piece; subclasses override.
+    symbol = "?"
+
+    def __post_init__(self) -> None:
+        # Render once at construction instead of on every board print.
+        self._glyph = self.symbol if self.color == Color.WHITE else self.symbol.lower()
 
     @abstractmethod
     def get_legal_moves(self, board: Board, position: Position) -> list[Position]:
@@ -19,35 +32,74 @@ class Piece(ABC):
         pass
 
     def __str__(self) -> str:
-        return self.__class__.__name__[0].upper() if self.color == Color.WHITE else self.__class__.__name__[0].lower()
+        return self._glyph
+
+    def _targets(self, board: Board, attacks: int) -> list[Position]:
+        """Converts an attack bitboard into end positions, excluding own pieces."""
+        return [Position.from_index(i) for i in iter_squares(attacks & ~board.color_mask(self.color))]
 
 class Pawn(Piece):
+    symbol = "P"
+
     def get_legal_moves(self, board: Board, position: Position) -> list[Position]:
-        # Implementation for Pawn logic (forward moves, captures, en passant)
-        # This would be fully implemented out in a real scenario.
-        return []
+        # Forward pushes and diagonal captures. En passant needs the move
+        # history and is left to a dedicated rule strategy.
+        index = position.index
+        occupied = board.occupied
+        enemy = board.color_mask(Color.BLACK if self.color == Color.WHITE else Color.WHITE)
+        step, start_row = (8, 1) if self.color == Color.WHITE else (-8, 6)
+
+        targets = 0
+        one = index + step
+        if 0 <= one < 64 and not occupied >> one & 1:
+            targets |= 1 << one
+            two = one + step
+            if position.row == start_row and not occupied >> two & 1:
+                targets |= 1 << two
+        for d_col in (-1, 1):
+            col = position.col + d_col
+            if 0 <= col < 8 and 0 <= one < 64:
+                capture = one + d_col
+                if enemy >> capture & 1:
+                    targets |= 1 << capture
+        return [Position.from_index(i) for i in iter_squares(targets)]
 
 class Rook(Piece):
+    symbol = "R"
+
     def get_legal_moves(self, board: Board, position: Position) -> list[Position]:
-        # Implementation for Rook logic (horizontal and vertical)
-        return []
+        return self._targets(board, rook_attacks(position.index, board.occupied))
 
 class Knight(Piece):
+    symbol = "N"
+
     def get_legal_moves(self, board: Board, position: Position) -> list[Position]:
-        # Implementation for Knight logic (L-shape)
-        return []
+        return self._targets(board, KNIGHT_ATTACKS[position.index])
 
 class Bishop(Piece):
+    symbol = "B"
+
     def get_legal_moves(self, board: Board, position: Position) -> list[Position]:
-        # Implementation for Bishop logic (diagonal)
-        return []
+        return self._targets(board, bishop_attacks(position.index, board.occupied))
 
 class Queen(Piece):
+    symbol = "Q"
+
     def get_legal_moves(self, board: Board, position: Position) -> list[Position]:
-        # Implementation for Queen logic (horizontal, vertical, diagonal)
-        return []
+        return self._targets(board, queen_attacks(position.index, board.occupied))
 
 class King(Piece):
+    symbol = "K"
+
     def get_legal_moves(self, board: Board, position: Position) -> list[Position]:
-        # Implementation for King logic (one square in any direction, castling)
-        return []
+        # Castling is validated separately by CastlingStrategy.
+        return self._targets(board, KING_ATTACKS[position.index])
+
+
+# Flyweight instances: one per (type, color), shared by every board.
+WHITE_PAWN, BLACK_PAWN = Pawn(Color.WHITE), Pawn(Color.BLACK)
+WHITE_ROOK, BLACK_ROOK = Rook(Color.WHITE), Rook(Color.BLACK)
+WHITE_KNIGHT, BLACK_KNIGHT = Knight(Color.WHITE), Knight(Color.BLACK)
+WHITE_BISHOP, BLACK_BISHOP = Bishop(Color.WHITE), Bishop(Color.BLACK)
+WHITE_QUEEN, BLACK_QUEEN = Queen(Color.WHITE), Queen(Color.BLACK)
+WHITE_KING, BLACK_KING = King(Color.WHITE), King(Color.BLACK)
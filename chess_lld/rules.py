@@ -1,3 +1,4 @@
+import threading
 from abc import ABC, abstractmethod
 
 from models import Move
@@ -9,16 +10,39 @@ class MoveValidator(ABC):
     def validate(self, board: Board, move: Move) -> bool:
         pass
 
+    def applies_to(self, move: Move) -> bool:
+        """Whether this rule is relevant to the move. Rules that only constrain
+        special moves override this so the engine can skip them entirely."""
+        return True
+
 class CheckStrategy(MoveValidator):
     """Checks if a move leaves the player's own king in check."""
+    def __init__(self) -> None:
+        # The game's board is shared and immutable, so moves are probed on a
+        # per-thread scratch board whose storage is reused between calls.
+        self._local = threading.local()
+
+    def _scratch_board(self) -> Board:
+        scratch: Board | None = getattr(self._local, "board", None)
+        if scratch is None:
+            scratch = Board()
+            self._local.board = scratch
+        return scratch
+
     def validate(self, board: Board, move: Move) -> bool:
-        # 1. Apply the move to a temporary board
+        # 1. Make the move in place on a private copy of the board
+        scratch = self._scratch_board()
+        scratch.load_from(board)
+        scratch.apply_move_inplace(move)
         # 2. Check if the king of the move's color is attacked on the new board
         # 3. Return False if it is, True otherwise
         return True # Placeholder
 
 class CastlingStrategy(MoveValidator):
     """Validates the specific rules for castling."""
+    def applies_to(self, move: Move) -> bool:
+        return move.is_castling
+
     def validate(self, board: Board, move: Move) -> bool:
         if not move.is_castling:
             return True
@@ -29,12 +53,20 @@ class CastlingStrategy(MoveValidator):
 
 class RuleEngine:
     """The centralized decision-making unit. Uses a list of validation strategies."""
-    def __init__(self):
+    def __init__(self) -> None:
         self._validators: list[MoveValidator] = [
             CheckStrategy(),
             CastlingStrategy(),
             # Other strategies like EnPassantStrategy could be added here
         ]
+        # Split once so the hot path only dispatches to rules that can matter:
+        # unconditional rules always run, the others only when applies_to() says so.
+        self._always: tuple[MoveValidator, ...] = tuple(
+            v for v in self._validators if type(v).applies_to is MoveValidator.applies_to
+        )
+        self._conditional: tuple[MoveValidator, ...] = tuple(
+            v for v in self._validators if type(v).applies_to is not MoveValidator.applies_to
+        )
 
     def is_move_valid(self, board: Board, move: Move) -> bool:
         """Validates a move by checking the piece's own logic and all registered rule strategies."""
@@ -50,8 +82,12 @@ class RuleEngine:
             pass # For now, we allow it to pass to test strategies
 
         # 2. Check all complex/contextual rules using the Strategy pattern
-        for validator in self._validators:
+        for validator in self._always:
             if not validator.validate(board, move):
                 return False
 
+        for validator in self._conditional:
+            if validator.applies_to(move) and not validator.validate(board, move):
+                return False
+
         return True
@@ -1,12 +1,22 @@
-from threading import Thread, Lock, RLock
+import itertools
+from threading import Thread, Lock, RLock, Event
 from queue import SimpleQueue
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Literal
 
 from exceptiongroup import catch
 
 
+# Poison pill placed on the queue once per worker by stopScheduler.
+_SHUTDOWN = object()
+
+# Task metadata is striped across this many dicts (a power of two) so that
+# concurrent submitters rarely contend on the same lock.
+NUM_SHARDS = 16
+
+
 class TaskStatus(Enum):
     NONE = 0
     QUEUED = 1
@@ -21,24 +31,44 @@ class TaskMetadata:
     instruction: Any = None
     result: Any = None
     exception: Exception = None
+    # Set by the worker once status/result/exception are final.
+    done: Event = field(default_factory=Event)
+    # Only used in "process" mode, where the executor tracks execution.
+    future: Future = None
 
 
 class Scheduler:
-    def __init__(self, num_workers=10):
+    """
+    mode="thread" (default) runs tasks on a pool of worker threads, which
+    suits I/O-bound work. mode="process" dispatches tasks to a
+    ProcessPoolExecutor so CPU-bound work is not serialized by the GIL;
+    tasks and their results must then be picklable.
+    """
+    def __init__(self, num_workers=10, mode: Literal["thread", "process"] = "thread"):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown scheduler mode: {mode}")
         self.description = "Scheduler"
+        self.mode = mode
         self.taskQueue = SimpleQueue()
 
         # component to store task metadata (results, status, exception)
-        self.taskMetadataLock = Lock()
-        self.taskMetadata = {}
+        # Sharded by task id, each shard with its own lock. The locks only
+        # guard insertion; reads use dict.get, which is atomic under CPython,
+        # and per-task state is published via an Event.
+        self.taskMetadataShards = tuple({} for _ in range(NUM_SHARDS))
+        self.taskMetadataLocks = tuple(Lock() for _ in range(NUM_SHARDS))
 
-        # component to generate id
-        self.idLock = Lock()
-        self.latestId = 0
+        # component to generate id; next() on itertools.count is a single C
+        # call, so it is atomic under the GIL and needs no lock.
+        self._idCounter = itertools.count(1)
 
         # worker thread pool
         self.workerPools = []
         self.numWorker = num_workers
+        self.processPool = None
+        if self.mode == "process":
+            self.processPool = ProcessPoolExecutor(max_workers=self.numWorker)
+            return
         # hard code to 10 workers
         for i in range(self.numWorker):
             thread = Thread(target=self._worker_task)
@@ -48,40 +78,63 @@ class Scheduler:
     def _worker_task(self):
         while True:
 
-            taskId, taskMetadata = self.taskQueue.get()
-            if not taskId and not taskMetadata:
+            item = self.taskQueue.get()
+            if item is _SHUTDOWN:
                 return
+            taskId, taskMetadata = item
 
-            func, arg, krwargs = None, None, None
-            # Set status that we're processing the task.
-            with self.taskMetadataLock:
-                if taskId not in self.taskMetadata:
-                    raise Exception  # can raise another exception.
-                self.taskMetadata[taskId].status = TaskStatus.PROCESSING
-                func, arg, krwargs = taskMetadata.instruction
+            # Set status that we're processing the task. Each task is owned by
+            # exactly one worker once dequeued, so no lock is needed here.
+            taskMetadata.status = TaskStatus.PROCESSING
+            func, arg, krwargs = taskMetadata.instruction
 
             result, exception, status = None, None, TaskStatus.FAILED
             try:
-                result = func(*arg)
+                result = func(*arg, **(krwargs or {}))
                 status = TaskStatus.SUCCESS
             except Exception as e:
                 exception = e
             finally:
-                with self.taskMetadataLock:
-                    taskMetadata.status = status
-                    taskMetadata.exception = exception
-                    taskMetadata.result = result
+                self._complete_task(taskMetadata, status, result, exception)
+
+    @staticmethod
+    def _complete_task(taskMetadata, status, result, exception):
+        # Publish result/exception before the terminal status so a
+        # reader that observes SUCCESS/FAILED also sees the payload.
+        taskMetadata.exception = exception
+        taskMetadata.result = result
+        taskMetadata.status = status
+        taskMetadata.done.set()
+
+    def _on_future_done(self, taskMetadata, future):
+        # future.exception() raises for a cancelled future; the task must
+        # still finish, or a blocking get_result would wait forever.
+        if future.cancelled():
+            self._complete_task(taskMetadata, TaskStatus.FAILED, None, CancelledError())
+            return
+        exception = future.exception()
+        if exception is None:
+            self._complete_task(taskMetadata, TaskStatus.SUCCESS, future.result(), None)
+        else:
+            self._complete_task(taskMetadata, TaskStatus.FAILED, None, exception)
 
     def stopScheduler(self):
+        if self.processPool is not None:
+            self.processPool.shutdown(wait=True)
+            return
         for i in range(self.numWorker):
-            self.taskQueue.put((None, None))
+            self.taskQueue.put(_SHUTDOWN)
         for worker in self.workerPools:
             worker.join()
 
+    def _shard_index(self, task_id) -> int:
+        return hash(task_id) & (NUM_SHARDS - 1)
+
+    def _get_task(self, task_id):
+        return self.taskMetadataShards[self._shard_index(task_id)].get(task_id)
+
     def _generate_id(self):
-        with self.idLock:
-            self.latestId += 1
-            return self.latestId
+        return next(self._idCounter)
 
     def add_task(self, func, args, kwargs):
         task_id = self._generate_id()
@@ -89,28 +142,39 @@ class Scheduler:
         taskMetadata = TaskMetadata(status=TaskStatus.QUEUED)
         taskMetadata.instruction = (func, args, kwargs)
 
-        with self.taskMetadataLock:
-            self.taskMetadata[task_id] = taskMetadata
+        shard = self._shard_index(task_id)
+        with self.taskMetadataLocks[shard]:
+            self.taskMetadataShards[shard][task_id] = taskMetadata
 
-        self.taskQueue.put((task_id, taskMetadata))
+        if self.processPool is not None:
+            taskMetadata.future = self.processPool.submit(func, *args, **(kwargs or {}))
+            taskMetadata.future.add_done_callback(
+                lambda future: self._on_future_done(taskMetadata, future))
+        else:
+            self.taskQueue.put((task_id, taskMetadata))
         return task_id
 
     def get_status(self, task_id: int) -> TaskStatus:
-        with self.taskMetadataLock:
-            if task_id not in self.taskMetadata:
-                return TaskStatus.NONE
-            return self.taskMetadata[task_id].status
-
-    def get_result(self, task_id):
-        with self.taskMetadataLock:
-            if task_id not in self.taskMetadata:
-                # 3. Raise KeyError for unknown task ID
-                raise KeyError(f"Task ID {task_id} not found.")
-            
-            task = self.taskMetadata[task_id]
-            # 2. If the task failed, return the exception
-            if task.status == TaskStatus.FAILED:
-                return task.exception
-            
-            # For SUCCESS or other statuses, return the result (which may be None)
-            return task.result
+        task = self._get_task(task_id)
+        if task is None:
+            return TaskStatus.NONE
+        if task.status == TaskStatus.QUEUED and task.future is not None and task.future.running():
+            return TaskStatus.PROCESSING
+        return task.status
+
+    def get_result(self, task_id, block: bool = False, timeout: float | None = None):
+        task = self._get_task(task_id)
+        if task is None:
+            # 3. Raise KeyError for unknown task ID
+            raise KeyError(f"Task ID {task_id} not found.")
+
+        # Optionally wait for the worker to finish instead of polling get_status.
+        if block:
+            task.done.wait(timeout)
+
+        # 2. If the task failed, return the exception
+        if task.status == TaskStatus.FAILED:
+            return task.exception
+
+        # For SUCCESS or other statuses, return the result (which may be None)
+        return task.result
@@ -3,6 +3,7 @@ import pytest
 import sys
 import os
 from threading import Thread
+from concurrent.futures import CancelledError
 
 sys.path.insert(0, os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..")))
@@ -76,12 +77,48 @@ class TestScheduler:
         assert isinstance(result, ValueError)
         assert str(result) == "This task was meant to fail"
 
+    def test_get_result_blocks_until_done(self, scheduler):
+        """Tests that a blocking get_result waits for the worker to finish."""
+        task_id = scheduler.add_task(long_running_task, args=[0.2], kwargs={})
+
+        assert scheduler.get_result(task_id, block=True, timeout=5) == "Slept for 0.2 seconds"
+        assert scheduler.get_status(task_id) == TaskStatus.SUCCESS
+
     def test_get_non_existent_task(self, scheduler):
         """Tests that getting status/result for a fake task ID behaves correctly."""
         assert scheduler.get_status("fake-id") == TaskStatus.NONE
         with pytest.raises(KeyError):
             scheduler.get_result("fake-id")
 
+    def test_process_mode(self):
+        """Tests that tasks run to completion on the process pool."""
+        s = Scheduler(num_workers=2, mode="process")
+        try:
+            ok_id = s.add_task(successful_task, args=[2, 3], kwargs={})
+            fail_id = s.add_task(failing_task, args=[], kwargs={})
+
+            assert s.get_result(ok_id, block=True, timeout=10) == 5
+            assert s.get_status(ok_id) == TaskStatus.SUCCESS
+            result = s.get_result(fail_id, block=True, timeout=10)
+            assert isinstance(result, ValueError)
+            assert s.get_status(fail_id) == TaskStatus.FAILED
+        finally:
+            s.stopScheduler()
+
+    def test_process_mode_cancelled_task_fails(self):
+        """Tests that a cancelled process-pool task completes as FAILED."""
+        s = Scheduler(num_workers=1, mode="process")
+        try:
+            task_ids = [s.add_task(long_running_task, args=[0.3], kwargs={}) for _ in range(4)]
+            # The last task is still pending behind the single busy worker.
+            assert s._get_task(task_ids[-1]).future.cancel()
+
+            result = s.get_result(task_ids[-1], block=True, timeout=5)
+            assert isinstance(result, CancelledError)
+            assert s.get_status(task_ids[-1]) == TaskStatus.FAILED
+        finally:
+            s.stopScheduler()
+
     def test_concurrency_and_stress(self, scheduler):
         """Submits many tasks from multiple threads to test concurrent execution."""
         num_threads = 10
@@ -14,14 +14,15 @@ class BitwiseInstructionSet(InstructionSet):
             return 0, dividend_abs
 
         quotient = 0
-        temp_divisor = divisor_abs
-        
+
         # Find the largest power of 2 that the divisor can be multiplied by
-        # without exceeding the dividend.
-        power = 0
-        while (temp_divisor << 1) <= dividend_abs:
-            temp_divisor <<= 1
-            power += 1
+        # without exceeding the dividend. The bit lengths give it directly
+        # (off by at most one) instead of probing one shift at a time.
+        power = dividend_abs.bit_length() - divisor_abs.bit_length()
+        temp_divisor = divisor_abs << power
+        if temp_divisor > dividend_abs:
+            temp_divisor >>= 1
+            power -= 1
 
         # Repeatedly subtract these scaled divisors
         while power >= 0:
@@ -33,3 +34,12 @@ class BitwiseInstructionSet(InstructionSet):
             power -= 1
             
         return quotient, dividend_abs
+
+class NativeInstructionSet(InstructionSet):
+    """Delegates to the hardware divide instruction via the builtin divmod.
+
+    Use when the host's native division is permitted; a single C call is far
+    cheaper than the per-bit loop of BitwiseInstructionSet.
+    """
+    def divide(self, dividend_abs: int, divisor_abs: int) -> tuple[int, int]:
+        return divmod(dividend_abs, divisor_abs)
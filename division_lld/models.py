@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Operand:
     """Immutable value object for an operand, separating sign from absolute value."""
     absolute_value: int
@@ -12,7 +12,7 @@ class Operand:
             raise TypeError("Operand value must be an integer.")
         return cls(abs(value), value < 0)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DivisionResult:
     """Immutable value object for the result of a division."""
     quotient: int
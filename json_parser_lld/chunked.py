@@ -0,0 +1,220 @@
+"""
+Incremental parsing for inputs too large to hold in memory at once.
+
+ChunkedParser accepts the document piece by piece (str or UTF-8 bytes, split
+anywhere) and hands back each value as soon as it is complete, so memory is
+bounded by the largest single value rather than the whole input:
+
+* mode="array" (default): the input is one top-level JSON array and every
+  element is emitted as soon as its closing ',' or ']' arrives.
+* mode="lines": the input is JSON Lines, one value per line.
+
+Only the element boundaries are found incrementally; each complete element is
+then parsed (and validated) by loads(). Error positions are reported relative
+to the whole stream, not to the chunk or element they were found in.
+"""
+import codecs
+import re
+from typing import Any, Iterable, Iterator, List, Literal, Tuple, Union
+
+from exceptions import (
+    MalformedJsonException,
+    UnexpectedEndOfInputException,
+    UnexpectedTokenException,
+)
+from parser import loads
+
+# Characters that can change the scanner's state outside a string. Newlines
+# only matter in "lines" mode, where they end a value.
+_ARRAY_SPECIAL = re.compile(r'[{}\[\]",]')
+_LINES_SPECIAL = re.compile(r'[{}\[\]"\n]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class ChunkedParser:
+    def __init__(self, mode: Literal["array", "lines"] = "array"):
+        if mode not in ("array", "lines"):
+            raise ValueError(f"Unknown chunked parser mode: {mode}")
+        self.mode = mode
+        self._special = _ARRAY_SPECIAL if mode == "array" else _LINES_SPECIAL
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        # Unconsumed input; _buffer[0] sits at (_line, _column) in the stream.
+        self._buffer = ""
+        self._line = 1
+        self._column = 1
+        # Scanner state, carried across chunks.
+        self._pos = 0  # next buffer offset to scan
+        self._start = 0  # buffer offset where the current value begins
+        self._depth = 0
+        self._in_string = False
+        self._opened = False  # "array" mode: the top-level '[' was seen
+        self._closed = False  # "array" mode: the matching ']' was seen
+        self._count = 0  # values emitted so far
+
+    def push(self, chunk: Union[str, bytes]) -> List[Any]:
+        """
+        Feeds the next piece of input and returns the values it completed.
+        """
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        self._buffer += chunk
+        values = self._scan()
+        self._discard_consumed()
+        return values
+
+    def finish(self) -> List[Any]:
+        """
+        Signals the end of input, returning any final value. Raises if the
+        input stopped in the middle of a value.
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        values = self._scan()
+        rest = self._buffer[self._start:]
+        if self.mode == "lines":
+            if rest.strip():
+                values.append(self._parse(self._start, len(self._buffer)))
+        elif not self._opened:
+            line, column = self._location(len(self._buffer))
+            raise UnexpectedEndOfInputException("'['", line, column)
+        elif not self._closed:
+            # Let loads() report what the unfinished element is missing.
+            if rest.strip():
+                self._parse(self._start, len(self._buffer))
+            line, column = self._location(len(self._buffer))
+            raise UnexpectedEndOfInputException("',' or ']'", line, column)
+        self._discard_consumed()
+        return values
+
+    def _scan(self) -> List[Any]:
+        values: List[Any] = []
+        buffer = self._buffer
+        pos = self._pos
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == "\\":
+                    if match.end() == len(buffer):
+                        # The escaped character has not arrived yet.
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                continue
+
+            if self._closed:
+                self._check_trailing(pos)
+                pos = len(buffer)
+                break
+
+            match = self._special.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            char, pos = match.group(), match.end()
+
+            if self.mode == "array" and not self._opened:
+                if char != "[" or buffer[self._start:match.start()].strip():
+                    line, column = self._location(match.start())
+                    raise MalformedJsonException(
+                        "Expected '[' at the start of a chunked array", line, column
+                    )
+                self._opened = True
+                self._depth = 1
+                self._start = pos
+            elif char == '"':
+                self._in_string = True
+            elif char == "{" or char == "[":
+                self._depth += 1
+            elif char == "}" or char == "]":
+                self._depth -= 1
+                if self.mode == "array" and self._depth == 0:
+                    if self._count or buffer[self._start:match.start()].strip():
+                        # Parsed first, so a bracket mismatch inside the
+                        # element is reported where it actually occurs.
+                        values.append(self._element(match.start()))
+                    if char != "]":
+                        line, column = self._location(match.start())
+                        raise UnexpectedTokenException("']'", f"'{char}'", line, column)
+                    self._closed = True
+                    self._start = pos
+            elif char == "," and self._depth == 1:
+                values.append(self._element(match.start()))
+                self._start = pos
+            elif char == "\n" and self._depth == 0:
+                if buffer[self._start:match.start()].strip():
+                    values.append(self._parse(self._start, match.start()))
+                self._start = pos
+        self._pos = pos
+        return values
+
+    def _element(self, end: int) -> Any:
+        """Parses the array element ending at buffer offset `end`."""
+        if not self._buffer[self._start:end].strip():
+            line, column = self._location(end)
+            raise MalformedJsonException(
+                "Trailing comma not allowed in array" if self._buffer[end] == "]"
+                else "Expected JSON value before ','",
+                line,
+                column,
+            )
+        return self._parse(self._start, end)
+
+    def _parse(self, start: int, end: int) -> Any:
+        try:
+            value = loads(self._buffer[start:end])
+        except MalformedJsonException as e:
+            self._relocate(e, start)
+            raise
+        self._count += 1
+        return value
+
+    def _check_trailing(self, pos: int) -> None:
+        extra = self._buffer[pos:]
+        if extra.strip():
+            offset = pos + len(extra) - len(extra.lstrip())
+            line, column = self._location(offset)
+            raise MalformedJsonException("Extra data after JSON document", line, column)
+
+    def _location(self, offset: int) -> Tuple[int, int]:
+        """Stream (line, column) of a buffer offset."""
+        newlines = self._buffer.count("\n", 0, offset)
+        if newlines == 0:
+            return self._line, self._column + offset
+        return self._line + newlines, offset - self._buffer.rfind("\n", 0, offset)
+
+    def _relocate(self, error: MalformedJsonException, start: int) -> None:
+        """Rewrites an error's element-relative position as a stream position."""
+        if error.line is None or error.column is None:
+            return
+        base_line, base_column = self._location(start)
+        if error.line == 1:
+            error.column += base_column - 1
+        error.line += base_line - 1
+
+    def _discard_consumed(self) -> None:
+        """Drops the input before the current value, keeping memory bounded."""
+        consumed = self._start
+        if consumed == 0:
+            return
+        self._line, self._column = self._location(consumed)
+        self._buffer = self._buffer[consumed:]
+        self._pos -= consumed
+        self._start = 0
+
+
+def parse_chunked(
+    chunks: Iterable[Union[str, bytes]], mode: Literal["array", "lines"] = "array"
+) -> Iterator[Any]:
+    """
+    Yields the values of a chunked input (e.g. a file read in blocks) as they
+    complete. See ChunkedParser for the supported modes.
+    """
+    parser = ChunkedParser(mode)
+    for chunk in chunks:
+        yield from parser.push(chunk)
+    yield from parser.finish()
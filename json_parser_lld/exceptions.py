@@ -1,14 +1,27 @@
+from typing import Optional
+
 class MalformedJsonException(Exception):
     """
     Custom exception for indicating malformed JSON input.
+
+    Only the raw fields are stored when the exception is raised; the message
+    is formatted in __str__, so raise sites on the parser's hot path do no
+    string work. Subclasses override the `message` property. Exception.args
+    keeps the constructor arguments, so instances still pickle.
     """
-    def __init__(self, message, line=None, column=None):
-        self.message = message
+    def __init__(self, message: Optional[str], line: Optional[int] = None, column: Optional[int] = None) -> None:
+        self._message = message
         self.line = line
         self.column = column
-        super().__init__(self._format_message())
 
-    def _format_message(self):
+    @property
+    def message(self) -> Optional[str]:
+        return self._message
+
+    def __str__(self) -> str:
+        return self._format_message()
+
+    def _format_message(self) -> str:
         if self.line is not None and self.column is not None:
             return f"Malformed JSON at line {self.line}, column {self.column}: {self.message}"
         elif self.line is not None:
@@ -19,53 +32,72 @@ class UnexpectedTokenException(MalformedJsonException):
     """
     Exception raised when an unexpected token is encountered during parsing.
     """
-    def __init__(self, expected, actual, line=None, column=None):
-        message = f"Expected {expected}, but found {actual}"
-        super().__init__(message, line, column)
+    def __init__(self, expected: object, actual: object, line: Optional[int] = None, column: Optional[int] = None) -> None:
+        self.expected = expected
+        self.actual = actual
+        super().__init__(None, line, column)
+
+    @property
+    def message(self) -> str:
+        # expected/actual may be TokenType members; their names are only
+        # looked up once the message is actually needed.
+        expected = getattr(self.expected, "name", self.expected)
+        actual = getattr(self.actual, "name", self.actual)
+        return f"Expected {expected}, but found {actual}"
 
 class InvalidNumberException(MalformedJsonException):
     """
     Exception raised when an invalid number format is encountered.
     """
-    def __init__(self, value, line=None, column=None):
-        message = f"Invalid number format: '{value}'"
-        super().__init__(message, line, column)
+    def __init__(self, value: str, line: Optional[int] = None, column: Optional[int] = None) -> None:
+        self.value = value
+        super().__init__(None, line, column)
+
+    @property
+    def message(self) -> str:
+        return f"Invalid number format: '{self.value}'"
 
 class InvalidStringException(MalformedJsonException):
     """
     Exception raised when an invalid string format or escape sequence is encountered.
     """
-    def __init__(self, message, line=None, column=None):
+    def __init__(self, message: str, line: Optional[int] = None, column: Optional[int] = None) -> None:
         super().__init__(message, line, column)
 
 class UnterminatedStringException(MalformedJsonException):
     """
     Exception raised when an unterminated string is encountered.
     """
-    def __init__(self, line=None, column=None):
-        message = "Unterminated string literal"
-        super().__init__(message, line, column)
+    def __init__(self, line: Optional[int] = None, column: Optional[int] = None) -> None:
+        super().__init__("Unterminated string literal", line, column)
 
 class UnterminatedCommentException(MalformedJsonException):
     """
     Exception raised when an unterminated multi-line comment is encountered.
     """
-    def __init__(self, line=None, column=None):
-        message = "Unterminated multi-line comment"
-        super().__init__(message, line, column)
+    def __init__(self, line: Optional[int] = None, column: Optional[int] = None) -> None:
+        super().__init__("Unterminated multi-line comment", line, column)
 
 class UnexpectedEndOfInputException(MalformedJsonException):
     """
     Exception raised when the end of the input is reached unexpectedly.
     """
-    def __init__(self, expected_token, line=None, column=None):
-        message = f"Unexpected end of input, expected {expected_token}"
-        super().__init__(message, line, column)
+    def __init__(self, expected_token: object, line: Optional[int] = None, column: Optional[int] = None) -> None:
+        self.expected_token = expected_token
+        super().__init__(None, line, column)
+
+    @property
+    def message(self) -> str:
+        return f"Unexpected end of input, expected {self.expected_token}"
 
 class DuplicateKeyException(MalformedJsonException):
     """
     Exception raised when a duplicate key is found in a JSON object.
     """
-    def __init__(self, key, line=None, column=None):
-        message = f"Duplicate key '{key}' found in object"
-        super().__init__(message, line, column)
\ No newline at end of file
+    def __init__(self, key: str, line: Optional[int] = None, column: Optional[int] = None) -> None:
+        self.key = key
+        super().__init__(None, line, column)
+
+    @property
+    def message(self) -> str:
+        return f"Duplicate key '{self.key}' found in object"
\ No newline at end of file
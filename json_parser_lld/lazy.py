@@ -0,0 +1,183 @@
+"""
+On-demand ("lazy") parsing on top of the stage-1 structural index.
+
+loads_lazy() indexes the document once (see structural.py) and returns a view
+over the top-level object or array. Nothing inside it is decoded until it is
+accessed: indexing a view splits only that container into its members by
+hopping through the structural offsets, then decodes just the member asked
+for. Nested containers come back as further views, scalars as native values.
+Subtrees that are never touched are never tokenized or allocated.
+
+Because untouched parts are never parsed, they are also never validated; call
+to_native() (or use loads()) when the whole document must be checked.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from exceptions import (
+    DuplicateKeyException,
+    MalformedJsonException,
+    UnexpectedEndOfInputException,
+)
+from models import JsonValue
+from parser import loads
+from structural import structural_indices
+
+# (text start offset, first structural position, end structural position)
+# of one container member: its text is source[start:index[end]] and its own
+# structural characters are index[first:end].
+_Segment = Tuple[int, int, int]
+
+# A string literal with no escapes (and any whitespace after it). Nearly every
+# key and most string values look like this, and their value is just the text
+# between the quotes, so they are sliced out instead of going through loads().
+_PLAIN_STRING = re.compile(r'"([^"\\\x00-\x1f]*)"[ \t\n\r]*')
+
+
+class _LazyContainer(JsonValue):
+    __slots__ = ("_source", "_index", "_open_pos", "_close_pos", "_segments")
+
+    def __init__(self, source: str, index: List[int], open_pos: int):
+        self._source = source
+        self._index = index
+        self._open_pos = open_pos
+        self._close_pos: Optional[int] = None
+        self._segments: Optional[List[_Segment]] = None
+
+    def _split(self) -> List[_Segment]:
+        """
+        Splits this container into its top-level members by walking the
+        structural index, tracking only the bracket depth. Done once per view.
+        """
+        if self._segments is not None:
+            return self._segments
+        source, index = self._source, self._index
+        close_char = "}" if source[index[self._open_pos]] == "{" else "]"
+        segments: List[_Segment] = []
+        start = index[self._open_pos] + 1
+        first = pos = self._open_pos + 1
+        depth = 0
+        while pos < len(index):
+            char = source[index[pos]]
+            if char == "{" or char == "[":
+                depth += 1
+            elif char == "}" or char == "]":
+                if depth == 0:
+                    if segments or source[start:index[pos]].strip():
+                        segments.append(self._segment(start, first, pos))
+                    self._segments, self._close_pos = segments, pos
+                    return segments
+                depth -= 1
+            elif char == "," and depth == 0:
+                segments.append(self._segment(start, first, pos))
+                start, first = index[pos] + 1, pos + 1
+            pos += 1
+        raise UnexpectedEndOfInputException(f"'{close_char}'")
+
+    def _segment(self, start: int, first: int, end: int) -> _Segment:
+        if not self._source[start:self._index[end]].strip():
+            kind = "object" if isinstance(self, LazyJsonObject) else "array"
+            raise MalformedJsonException(f"Empty member or trailing comma in {kind}")
+        return start, first, end
+
+    def _materialize(self, start: int, first: int, end: int) -> Any:
+        """
+        Returns the member stored in source[start:index[end]]: a new view for a
+        nested container, otherwise the fully decoded scalar.
+        """
+        text = self._source[start:self._index[end]].strip()
+        if text[:1] == "{":
+            return LazyJsonObject(self._source, self._index, first)
+        if text[:1] == "[":
+            return LazyJsonArray(self._source, self._index, first)
+        plain = _PLAIN_STRING.fullmatch(text)
+        if plain is not None:
+            return plain.group(1)
+        return loads(text)
+
+    def to_native(self) -> Any:
+        """Fully parses (and validates) this container."""
+        self._split()
+        assert self._close_pos is not None
+        return loads(self._source[self._index[self._open_pos]:self._index[self._close_pos] + 1])
+
+
+class LazyJsonArray(_LazyContainer):
+    """
+    A JSON array whose elements are decoded only when indexed.
+    """
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        return len(self._split())
+
+    def __getitem__(self, position: int) -> Any:
+        return self._materialize(*self._split()[position])
+
+    def __repr__(self) -> str:
+        return f'LazyJsonArray(len={len(self)})'
+
+
+class LazyJsonObject(_LazyContainer):
+    """
+    A JSON object whose values are decoded only when looked up by key.
+    """
+    __slots__ = ("_members",)
+
+    def __init__(self, source: str, index: List[int], open_pos: int):
+        super().__init__(source, index, open_pos)
+        self._members: Optional[Dict[str, _Segment]] = None
+
+    def _keyed(self) -> Dict[str, _Segment]:
+        """Maps each key to the segment holding its value. Done once per view."""
+        if self._members is not None:
+            return self._members
+        source, index = self._source, self._index
+        members: Dict[str, _Segment] = {}
+        for start, first, end in self._split():
+            # A member is `"key" : value`, so its first two structurals are
+            # the key's opening quote and the colon.
+            if end - first < 2 or source[index[first]] != '"' or source[index[first + 1]] != ":":
+                raise MalformedJsonException(
+                    f"Expected '\"key\": value' in object, found {source[start:index[end]].strip()!r}"
+                )
+            key_text = source[index[first]:index[first + 1]]
+            plain = _PLAIN_STRING.fullmatch(key_text)
+            key = plain.group(1) if plain is not None else loads(key_text)
+            if key in members:
+                raise DuplicateKeyException(key)
+            members[key] = (index[first + 1] + 1, first + 2, end)
+        self._members = members
+        return members
+
+    def __len__(self) -> int:
+        return len(self._keyed())
+
+    def __getitem__(self, key: str) -> Any:
+        return self._materialize(*self._keyed()[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keyed()
+
+    def keys(self) -> List[str]:
+        return list(self._keyed())
+
+    def __repr__(self) -> str:
+        return f'LazyJsonObject(keys={self.keys()})'
+
+
+def loads_lazy(json_string: str) -> Union[LazyJsonObject, LazyJsonArray, Any]:
+    """
+    Parses a JSON string on demand. A top-level object or array is returned as
+    a lazy view; any other document is small enough to parse directly.
+    """
+    text = json_string.strip()
+    if text[:1] not in ("{", "["):
+        return loads(json_string)
+    index = structural_indices(text)
+    root = LazyJsonObject(text, index, 0) if text[0] == "{" else LazyJsonArray(text, index, 0)
+    # Splitting the root finds where it closes; anything after that is an error.
+    root._split()
+    if root._close_pos != len(index) - 1 or index[-1] != len(text) - 1:
+        raise MalformedJsonException("Extra data after JSON document")
+    return root
@@ -1,18 +1,28 @@
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 class JsonValue:
     """
     Base class for all JSON values.
     """
+    # No per-instance __dict__ anywhere in the hierarchy: each subclass lists
+    # its fields in __slots__, which matters for trees with millions of leaves.
+    __slots__ = ()
+
+    # Set by the scalar subclasses; declared here so to_native() can read
+    # leaves without a method call.
+    _value: Any
+
     def to_native(self) -> Any:
         """
         Converts the JsonValue instance to its native Python representation.
         """
         raise NotImplementedError
 
+    # The comparisons return False rather than NotImplemented for foreign
+    # types: mypyc-compiled methods must return what they are annotated with.
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, JsonValue):
-            return NotImplemented
+            return False
         return self.to_native() == other.to_native()
 
     def __ne__(self, other: object) -> bool:
@@ -21,10 +31,27 @@ class JsonValue:
     def __hash__(self) -> int:
         return hash(self.to_native())
 
-class JsonString(JsonValue):
+class _JsonScalar(JsonValue):
+    """
+    Shared equality for the leaf types: same class and same value.
+    """
+    __slots__ = ("_value",)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return False
+        assert isinstance(other, _JsonScalar)
+        return self._value == other._value
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
+class JsonString(_JsonScalar):
     """
     Represents a JSON string.
     """
+    __slots__ = ()
+
     def __init__(self, value: str):
         self._value = value
 
@@ -34,10 +61,12 @@ class JsonString(JsonValue):
     def __repr__(self) -> str:
         return f'JsonString("{self._value}")'
 
-class JsonNumber(JsonValue):
+class JsonNumber(_JsonScalar):
     """
     Represents a JSON number (integer or float).
     """
+    __slots__ = ()
+
     def __init__(self, value: Union[int, float]):
         self._value = value
 
@@ -47,10 +76,12 @@ class JsonNumber(JsonValue):
     def __repr__(self) -> str:
         return f'JsonNumber({self._value})'
 
-class JsonBoolean(JsonValue):
+class JsonBoolean(_JsonScalar):
     """
     Represents a JSON boolean (true or false).
     """
+    __slots__ = ()
+
     def __init__(self, value: bool):
         self._value = value
 
@@ -60,12 +91,22 @@ class JsonBoolean(JsonValue):
     def __repr__(self) -> str:
         return f'JsonBoolean({self._value})'
 
-class JsonNull(JsonValue):
+# Shared instances for the values that dominate real payloads: booleans and
+# small integers (mirroring CPython's own -5..256 small-int cache). JsonValue
+# instances are never mutated, so handing out the same object is safe.
+JSON_TRUE = JsonBoolean(True)
+JSON_FALSE = JsonBoolean(False)
+_SMALL_INT_MIN, _SMALL_INT_MAX = -5, 256
+_SMALL_INT_CACHE = [JsonNumber(i) for i in range(_SMALL_INT_MIN, _SMALL_INT_MAX + 1)]
+
+class JsonNull(_JsonScalar):
     """
     Represents a JSON null.
     """
-    def __init__(self):
-        self._value = None
+    __slots__ = ()
+    # A class attribute rather than per-instance state: the JSON_NULL
+    # singleton carries no fields at all.
+    _value: Any = None
 
     def to_native(self) -> None:
         return self._value
@@ -80,11 +121,14 @@ class JsonArray(JsonValue):
     """
     Represents a JSON array.
     """
+    __slots__ = ("_values", "_hash")
+
     def __init__(self, values: List[JsonValue]):
         self._values = values
+        self._hash: Optional[int] = None
 
     def to_native(self) -> List[Any]:
-        return [value.to_native() for value in self._values]
+        return to_native(self)
 
     def __repr__(self) -> str:
         return f'JsonArray({self._values})'
@@ -95,15 +139,29 @@ class JsonArray(JsonValue):
     def __getitem__(self, key: int) -> JsonValue:
         return self._values[key]
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, JsonArray):
+            return JsonValue.__eq__(self, other)
+        return _structurally_equal(self, other)
+
+    def __hash__(self) -> int:
+        # JsonValue trees are not mutated after parsing, so the hash is stable.
+        if self._hash is None:
+            self._hash = hash(tuple(self._values))
+        return self._hash
+
 class JsonObject(JsonValue):
     """
     Represents a JSON object.
     """
+    __slots__ = ("_properties", "_hash")
+
     def __init__(self, properties: Dict[str, JsonValue]):
         self._properties = properties
+        self._hash: Optional[int] = None
 
     def to_native(self) -> Dict[str, Any]:
-        return {key: value.to_native() for key, value in self._properties.items()}
+        return to_native(self)
 
     def __repr__(self) -> str:
         return f'JsonObject({self._properties})'
@@ -115,4 +173,106 @@ class JsonObject(JsonValue):
         return self._properties[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self._properties
\ No newline at end of file
+        return key in self._properties
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, JsonObject):
+            return JsonValue.__eq__(self, other)
+        return _structurally_equal(self, other)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._properties.items()))
+        return self._hash
+
+
+def _structurally_equal(left: JsonValue, right: JsonValue) -> bool:
+    """
+    Compares two JsonValue trees node by node with an explicit stack, stopping
+    at the first mismatch instead of materializing both sides via to_native().
+    """
+    stack = [(left, right)]
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        if type(a) is not type(b):
+            if a != b:
+                return False
+        elif isinstance(a, JsonArray):
+            assert isinstance(b, JsonArray)
+            if len(a._values) != len(b._values):
+                return False
+            stack.extend(zip(a._values, b._values))
+        elif isinstance(a, JsonObject):
+            assert isinstance(b, JsonObject)
+            if a._properties.keys() != b._properties.keys():
+                return False
+            b_properties = b._properties
+            stack.extend((value, b_properties[key]) for key, value in a._properties.items())
+        elif a != b:
+            return False
+    return True
+
+
+def to_native(root: JsonValue) -> Any:
+    """
+    Converts a JsonValue tree to native Python objects.
+
+    Walks the tree with an explicit stack rather than recursing through
+    to_native() on every child, so there is no Python call per node and no
+    recursion limit on deeply nested documents. Each container's native
+    counterpart is created and attached to its parent up front, then filled
+    in when its (node, native) pair is popped.
+
+    The sizes are known from the source tree, so every native container is
+    allocated at its final size and filled in place: lists start as
+    placeholders, and dicts come from dict.fromkeys() on the source dict,
+    which sizes the table up front; assigning to existing keys never resizes.
+    """
+    if isinstance(root, JsonArray):
+        result: Any = [None] * len(root._values)
+    elif isinstance(root, JsonObject):
+        result = dict.fromkeys(root._properties)
+    else:
+        return root.to_native()
+    stack = [(root, result)]
+    while stack:
+        node, target = stack.pop()
+        items: Iterable[Tuple[Any, JsonValue]]
+        if isinstance(node, JsonArray):
+            items = enumerate(node._values)
+        else:
+            items = node._properties.items()
+        for key, value in items:
+            if isinstance(value, JsonArray):
+                child: Any = [None] * len(value._values)
+                stack.append((value, child))
+            elif isinstance(value, JsonObject):
+                child = dict.fromkeys(value._properties)
+                stack.append((value, child))
+            else:
+                child = value._value
+            target[key] = child
+    return result
+
+
+def wrap(native: Any) -> JsonValue:
+    """
+    Builds the JsonValue tree for a native Python value produced by the parser.
+    """
+    if native is None:
+        return JSON_NULL
+    if isinstance(native, bool):
+        return JSON_TRUE if native else JSON_FALSE
+    if type(native) is int and _SMALL_INT_MIN <= native <= _SMALL_INT_MAX:
+        return _SMALL_INT_CACHE[native - _SMALL_INT_MIN]
+    if isinstance(native, (int, float)):
+        return JsonNumber(native)
+    if isinstance(native, str):
+        return JsonString(native)
+    if isinstance(native, list):
+        return JsonArray([wrap(value) for value in native])
+    if isinstance(native, dict):
+        return JsonObject({key: wrap(value) for key, value in native.items()})
+    raise TypeError(f"Cannot wrap {type(native).__name__} as a JSON value")
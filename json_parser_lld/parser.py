@@ -1,4 +1,22 @@
-from typing import Any
+import json as _std_json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Optional C-accelerated backends for fast_loads(), fastest first. None of
+# these are required: loads() below is the from-scratch implementation.
+try:
+    import orjson as _native_json
+except ImportError:
+    try:
+        import ujson as _native_json  # type: ignore
+    except ImportError:
+        import json as _native_json  # type: ignore
+
+# orjson and ujson only hold 64-bit integers (orjson silently widens longer
+# ones to float). Integers that long are rare, so fast_loads() scans for a run
+# of 19+ digits, a cheap C-level search, and only then hands the document to
+# the standard library, which keeps them exact.
+_LONG_DIGITS = re.compile(r"\d{19}")
 
 from exceptions import (
     DuplicateKeyException,
@@ -6,231 +24,264 @@ from exceptions import (
     UnexpectedEndOfInputException,
     UnexpectedTokenException,
 )
-from models import (
-    JSON_NULL,
-    JsonArray,
-    JsonBoolean,
-    JsonNull,
-    JsonNumber,
-    JsonObject,
-    JsonString,
-    JsonValue,
-)
+from models import JsonValue, wrap
 from tokenizer import Token, Tokenizer, TokenType
 
+# Token types whose value is fully decoded by the tokenizer. Built once so the
+# membership test in _parse_value is a single hash lookup per value.
+_SCALAR_TOKENS = frozenset(
+    {TokenType.STRING, TokenType.NUMBER, TokenType.TRUE, TokenType.FALSE, TokenType.NULL}
+)
+
+# Placeholder for an object key whose value has not been parsed yet.
+_MISSING = object()
+
 
 class Parser:
     def __init__(self, json_string: str):
         self.tokenizer = Tokenizer(json_string)
-        self.tokens = self.tokenizer.tokenize()
-        self.current_token: Token = None
+        # Tokenize up front into parallel lists (type, value and start offset
+        # per token) and walk them with an index: no Token object per token,
+        # and line/column are only worked out for an error. On valid input
+        # the lists end with the tokenizer's EOF token.
+        self._types: List[TokenType] = []
+        self._values: List[Any] = []
+        self._offsets: List[int] = []
+        self._lex_error: Optional[MalformedJsonException] = None
+        try:
+            # The lists keep the tokens produced before a lexical error.
+            self.tokenizer.tokenize_into(self._types, self._values, self._offsets)
+        except MalformedJsonException as e:
+            # Defer it until the parser reaches that point, so a syntax
+            # error earlier in the document is still the one reported.
+            self._lex_error = e
+        self._last_index = len(self._types) - 1
+        self._index = -1
+        self._type: TokenType
         self._advance()  # Get the first token
 
-    def _advance(self):
-        """Advances to the next token."""
-        try:
-            self.current_token = next(self.tokens)
-        except StopIteration:
-            self.current_token = Token(
-                TokenType.EOF,
-                None,
-                self.tokenizer.line,
-                self.tokenizer.column,
-            )
-
-    def _eat(self, expected_type: TokenType):
+    @property
+    def current_token(self) -> Token:
+        """The current token, with its position, built on demand."""
+        line, column = self._position()
+        return Token(self._type, self._values[self._index], line, column)
+
+    def _position(self) -> Tuple[int, int]:
+        """(line, column) of the current token, for error messages."""
+        return self.tokenizer.location(self._offsets[self._index])
+
+    def _advance(self) -> None:
+        """Advances to the next token. Stays on EOF once it is reached."""
+        if self._index < self._last_index:
+            self._index += 1
+            self._type = self._types[self._index]
+        elif self._lex_error is not None:
+            raise self._lex_error
+
+    def parse(self) -> JsonValue:
         """
-        Consumes the current token if its type matches expected_type,
-        then advances to the next token. Raises an exception if types don't match.
+        Main entry point for parsing the JSON string into the JsonValue object
+        model. The tree is built from the native result on demand; callers that
+        only need Python objects should use parse_native() instead.
         """
-        if self.current_token.type == expected_type:
-            self._advance()
-        else:
-            raise UnexpectedTokenException(
-                expected_type.name,
-                self.current_token.type.name,
-                self.current_token.line,
-                self.current_token.column,
-            )
+        return wrap(self.parse_native())
 
-    def parse(self) -> JsonValue:
+    def parse_native(self) -> Any:
         """
-        Main entry point for parsing the JSON string.
+        Parses the JSON string straight into native dict/list/str/int/float/
+        bool/None values, without allocating a JsonValue per node.
         """
         value = self._parse_value()
-        if self.current_token.type != TokenType.EOF:
-            raise MalformedJsonException(
-                "Extra data after JSON document",
-                self.current_token.line,
-                self.current_token.column,
-            )
+        if self._type != TokenType.EOF:
+            raise MalformedJsonException("Extra data after JSON document", *self._position())
         return value
 
-    def _parse_value(self) -> JsonValue:
-        """
-        Parses any JSON value based on the current token type.
-        """
-        if self.current_token.type == TokenType.LEFT_BRACE:
-            return self._parse_object()
-        elif self.current_token.type == TokenType.LEFT_BRACKET:
-            return self._parse_array()
-        elif self.current_token.type == TokenType.STRING:
-            return self._parse_string()
-        elif self.current_token.type == TokenType.NUMBER:
-            return self._parse_number()
-        elif self.current_token.type == TokenType.TRUE:
-            return self._parse_boolean(True)
-        elif self.current_token.type == TokenType.FALSE:
-            return self._parse_boolean(False)
-        elif self.current_token.type == TokenType.NULL:
-            return self._parse_null()
-        elif self.current_token.type == TokenType.EOF:
-            raise UnexpectedEndOfInputException(
-                "JSON value", self.current_token.line, self.current_token.column
-            )
-        else:
-            raise UnexpectedTokenException(
-                "JSON value (object, array, string, number, true, false, or null)",
-                self.current_token.type.name,
-                self.current_token.line,
-                self.current_token.column,
-            )
-
-    def _parse_object(self) -> JsonObject:
-        """
-        Parses a JSON object: `{ "key": value, ... }`
-        """
-        self._eat(TokenType.LEFT_BRACE)
-        properties = {}
-        while self.current_token.type != TokenType.RIGHT_BRACE:
-            if self.current_token.type == TokenType.EOF:
-                raise UnexpectedEndOfInputException(
-                    "}", self.current_token.line, self.current_token.column
-                )
-
-            if self.current_token.type != TokenType.STRING:
-                raise UnexpectedTokenException(
-                    "String (object key)",
-                    self.current_token.type.name,
-                    self.current_token.line,
-                    self.current_token.column,
-                )
-
-            key_token = self.current_token
-            key = self._parse_string().to_native()
-
-            if key in properties:
-                raise DuplicateKeyException(
-                    key, key_token.line, key_token.column
-                )
-
-            self._eat(TokenType.COLON)
-            value = self._parse_value()
-            properties[key] = value
-
-            if self.current_token.type == TokenType.COMMA:
-                self._eat(TokenType.COMMA)
-                if self.current_token.type == TokenType.RIGHT_BRACE:
-                    # Trailing comma not allowed in strict JSON
-                    # Python's json module allows it with json.loads(s, strict=False)
-                    # For this challenge, we'll follow strict JSON, so a trailing comma is an error.
-                    raise MalformedJsonException(
-                        "Trailing comma not allowed in object",
-                        self.current_token.line,
-                        self.current_token.column,
-                    )
-            elif self.current_token.type == TokenType.EOF:
-                raise UnexpectedEndOfInputException(
-                    "',' or '}'", self.current_token.line, self.current_token.column
-                )
-            elif self.current_token.type != TokenType.RIGHT_BRACE:
-                raise UnexpectedTokenException(
-                    "',' or '}'",
-                    self.current_token.type.name,
-                    self.current_token.line,
-                    self.current_token.column,
-                )
-        self._eat(TokenType.RIGHT_BRACE)
-        return JsonObject(properties)
-
-    def _parse_array(self) -> JsonArray:
+    def _parse_value(self) -> Any:
         """
-        Parses a JSON array: `[ value, value, ... ]`
-        """
-        self._eat(TokenType.LEFT_BRACKET)
-        elements = []
-        while self.current_token.type != TokenType.RIGHT_BRACKET:
-            if self.current_token.type == TokenType.EOF:
-                raise UnexpectedEndOfInputException(
-                    "]", self.current_token.line, self.current_token.column
-                )
-            elements.append(self._parse_value())
-
-            if self.current_token.type == TokenType.COMMA:
-                self._eat(TokenType.COMMA)
-                if self.current_token.type == TokenType.RIGHT_BRACKET:
-                    # Trailing comma not allowed
-                    raise MalformedJsonException(
-                        "Trailing comma not allowed in array",
-                        self.current_token.line,
-                        self.current_token.column,
-                    )
-            elif self.current_token.type == TokenType.EOF:
-                raise UnexpectedEndOfInputException(
-                    "',' or ']'", self.current_token.line, self.current_token.column
-                )
-            elif self.current_token.type != TokenType.RIGHT_BRACKET:
-                raise UnexpectedTokenException(
-                    "',' or ']'",
-                    self.current_token.type.name,
-                    self.current_token.line,
-                    self.current_token.column,
-                )
-        self._eat(TokenType.RIGHT_BRACKET)
-        return JsonArray(elements)
-
-    def _parse_string(self) -> JsonString:
-        """
-        Parses a JSON string.
-        Assumes current_token is of type STRING.
-        """
-        value = self.current_token.value
-        self._eat(TokenType.STRING)
-        return JsonString(value)
+        Parses one complete JSON value, however deeply nested.
 
-    def _parse_number(self) -> JsonNumber:
-        """
-        Parses a JSON number.
-        Assumes current_token is of type NUMBER.
-        """
-        value = self.current_token.value
-        self._eat(TokenType.NUMBER)
-        return JsonNumber(value)
+        This is the recursive-descent grammar unrolled into a single loop over
+        an explicit stack of open containers, so nesting depth is bounded by
+        memory rather than the interpreter's recursion limit and there is no
+        Python call per node. `keys` runs parallel to `containers`: it holds
+        the pending key for an open object, or None for an open array.
 
-    def _parse_boolean(self, value: bool) -> JsonBoolean:
-        """
-        Parses a JSON boolean (true/false).
-        Assumes current_token is of type TRUE or FALSE.
+        The token cursor is kept in locals for the whole loop, so consuming a
+        token is an index increment and a list read rather than an _advance()
+        call. Reading past the last token can only happen when the tokenizer
+        stopped at a lexical error, which is raised from there.
         """
-        if value:
-            self._eat(TokenType.TRUE)
-        else:
-            self._eat(TokenType.FALSE)
-        return JsonBoolean(value)
+        containers: List[Any] = []
+        keys: List[Optional[str]] = []
+        types = self._types
+        values = self._values
+        index = self._index
+        token_type = self._type
+        key_pending = False
+        try:
+            while True:
+                if key_pending:
+                    # An object member starts with its key: `"key":`
+                    if token_type != TokenType.STRING:
+                        self._index = index
+                        if token_type == TokenType.EOF:
+                            raise UnexpectedEndOfInputException("}", *self._position())
+                        raise UnexpectedTokenException(
+                            "String (object key)", token_type, *self._position()
+                        )
+                    # Repeated short keys already share one object (see the
+                    # tokenizer's string cache).
+                    key = values[index]
+                    # Check for a duplicate and reserve the key's slot in one
+                    # dict operation; the value is stored over the placeholder
+                    # once parsed.
+                    if containers[-1].setdefault(key, _MISSING) is not _MISSING:
+                        self._index = index
+                        raise DuplicateKeyException(key, *self._position())
+                    keys[-1] = key
+                    index += 1
+                    token_type = types[index]
+                    if token_type != TokenType.COLON:
+                        self._index = index
+                        raise UnexpectedTokenException(
+                            TokenType.COLON, token_type, *self._position()
+                        )
+                    index += 1
+                    token_type = types[index]
+                    key_pending = False
 
-    def _parse_null(self) -> JsonNull:
-        """
-        Parses a JSON null.
-        Assumes current_token is of type NULL.
-        """
-        self._eat(TokenType.NULL)
-        return JSON_NULL
+                # Parse the start of a value: a scalar, or an opening bracket.
+                if token_type in _SCALAR_TOKENS:
+                    value = values[index]
+                    index += 1
+                    token_type = types[index]
+                elif token_type == TokenType.LEFT_BRACE:
+                    index += 1
+                    token_type = types[index]
+                    if token_type == TokenType.RIGHT_BRACE:
+                        index += 1
+                        token_type = types[index]
+                        value = {}
+                    else:
+                        properties: Dict[str, Any] = {}
+                        containers.append(properties)
+                        keys.append("")
+                        key_pending = True
+                        continue
+                elif token_type == TokenType.LEFT_BRACKET:
+                    index += 1
+                    token_type = types[index]
+                    if token_type == TokenType.RIGHT_BRACKET:
+                        index += 1
+                        token_type = types[index]
+                        value = []
+                    else:
+                        containers.append([])
+                        keys.append(None)
+                        continue
+                elif token_type == TokenType.EOF:
+                    # Inside an array a value is only ever expected after '[' or ','.
+                    self._index = index
+                    expected = "]" if keys and keys[-1] is None else "JSON value"
+                    raise UnexpectedEndOfInputException(expected, *self._position())
+                else:
+                    self._index = index
+                    raise UnexpectedTokenException(
+                        "JSON value (object, array, string, number, true, false, or null)",
+                        token_type,
+                        *self._position(),
+                    )
+
+                # A value is complete: store it in its parent and close every
+                # container that ends here, until one expects another member.
+                while containers:
+                    container = containers[-1]
+                    key = keys[-1]
+                    if key is None:
+                        container.append(value)
+                        if token_type == TokenType.COMMA:
+                            index += 1
+                            token_type = types[index]
+                            if token_type == TokenType.RIGHT_BRACKET:
+                                # Trailing comma not allowed
+                                self._index = index
+                                raise MalformedJsonException(
+                                    "Trailing comma not allowed in array", *self._position()
+                                )
+                            break
+                        elif token_type == TokenType.EOF:
+                            self._index = index
+                            raise UnexpectedEndOfInputException("',' or ']'", *self._position())
+                        elif token_type != TokenType.RIGHT_BRACKET:
+                            self._index = index
+                            raise UnexpectedTokenException(
+                                "',' or ']'", token_type, *self._position()
+                            )
+                    else:
+                        container[key] = value
+                        if token_type == TokenType.COMMA:
+                            index += 1
+                            token_type = types[index]
+                            if token_type == TokenType.RIGHT_BRACE:
+                                # Trailing comma not allowed in strict JSON
+                                # Python's json module allows it with json.loads(s, strict=False)
+                                # For this challenge, we'll follow strict JSON, so a trailing comma is an error.
+                                self._index = index
+                                raise MalformedJsonException(
+                                    "Trailing comma not allowed in object", *self._position()
+                                )
+                            key_pending = True
+                            break
+                        elif token_type == TokenType.EOF:
+                            self._index = index
+                            raise UnexpectedEndOfInputException("',' or '}'", *self._position())
+                        elif token_type != TokenType.RIGHT_BRACE:
+                            self._index = index
+                            raise UnexpectedTokenException(
+                                "',' or '}'", token_type, *self._position()
+                            )
+                    # The closing bracket: the finished container becomes the value.
+                    index += 1
+                    token_type = types[index]
+                    value = containers.pop()
+                    keys.pop()
+                else:
+                    self._index = index
+                    self._type = token_type
+                    return value
+        except IndexError:
+            # Ran past the tokens produced before a lexical error.
+            if self._lex_error is None:
+                raise
+            raise self._lex_error from None
 
 
-def loads(json_string: str) -> Any:
+def loads(json_string: str, strict_errors: bool = True) -> Any:
     """
     Parses a JSON string and returns the corresponding Python object.
+
+    With strict_errors=False the document is handed to fast_loads() instead:
+    much faster on large inputs, but malformed input raises the backend's
+    ValueError rather than a MalformedJsonException with a position, and
+    duplicate object keys are not rejected (the last one wins). Valid input
+    gives the same values in both modes.
+    """
+    if not strict_errors:
+        return fast_loads(json_string)
+    return Parser(json_string).parse_native()
+
+
+def fast_loads(json_string: str) -> Any:
+    """
+    Parses a JSON string straight to native Python objects using the fastest
+    available C parser (orjson, then ujson, then the standard library).
+
+    Skips the Tokenizer/Parser and the JsonValue tree entirely, so use it when
+    only the native result is needed and the exact error types above are not.
+    Errors surface as the backend's own exception (a ValueError subclass).
+    Documents with integers too wide for the backend go through the standard
+    library instead, so values are the same as loads() returns.
     """
-    parser = Parser(json_string)
-    json_value = parser.parse()
-    return json_value.to_native()
\ No newline at end of file
+    if _native_json is not _std_json and _LONG_DIGITS.search(json_string):
+        return _std_json.loads(json_string)
+    return _native_json.loads(json_string)
@@ -0,0 +1,82 @@
+"""
+Stage-1 structural indexing, in the spirit of simdjson's two-stage design.
+
+Instead of walking the input one character at a time in Python, a single
+compiled regex locates every structural character (`{ } [ ] : ,`) and the
+opening quote of every string. String bodies are consumed by the regex as a
+whole, so brackets or commas inside strings never show up as structural.
+The scan runs entirely inside the C `re` engine; stage 2 (the parser or a
+lazy view) then jumps between these offsets and only decodes what it needs.
+
+When NumPy is installed, large inputs are scanned with whole-array masks
+instead (see _structural_indices_numpy), which is faster again once the input
+is big enough to amortize the conversion to an array.
+
+This stage does not validate anything: a malformed document still yields an
+index, and the errors are reported by whoever consumes it.
+"""
+import re
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:  # the regex scan needs nothing beyond the stdlib
+    np = None  # type: ignore
+
+# A complete string literal (escapes included), a lone quote for an
+# unterminated string, or a single structural character.
+_STRUCTURAL_RE = re.compile(r'"(?:[^"\\]|\\.)*"|"|[{}\[\]:,]', re.DOTALL)
+_STRUCTURAL_CODES = [ord(char) for char in "{}[]:,"]
+
+# Below this many characters the NumPy setup costs more than it saves.
+NUMPY_MIN_LENGTH = 4096
+
+
+def structural_indices(json_string: str) -> List[int]:
+    """
+    Returns the offsets of all structural characters and string openings in
+    json_string, in ascending order.
+    """
+    if len(json_string) >= NUMPY_MIN_LENGTH:
+        return _large_input_scan(json_string)
+    return _structural_indices_regex(json_string)
+
+
+def _structural_indices_regex(json_string: str) -> List[int]:
+    return [match.start() for match in _STRUCTURAL_RE.finditer(json_string)]
+
+
+def _structural_indices_numpy(json_string: str) -> List[int]:
+    """
+    The same scan as a handful of vectorized passes over the code points.
+
+    A quote is real unless it is preceded by an odd run of backslashes, and a
+    character is inside a string when an odd number of real quotes precede
+    it. Every structural character outside a string, plus every opening
+    quote, is reported. Unlike the regex, an unterminated string swallows the
+    rest of the input; neither scan validates, so both are fine for
+    malformed documents.
+    """
+    # UTF-32 gives one array element per str index, so offsets line up.
+    codes = np.frombuffer(json_string.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    positions = np.arange(len(codes))
+    backslash = codes == ord("\\")
+    # Offset of the last non-backslash strictly before each position.
+    last_other = np.maximum.accumulate(np.where(backslash, -1, positions))
+    previous_other = np.concatenate(([-1], last_other[:-1]))
+    escaped = (positions - 1 - previous_other) % 2 == 1
+    quotes = (codes == ord('"')) & ~escaped
+    quotes_before = np.cumsum(quotes) - quotes
+    outside = quotes_before % 2 == 0
+    structural = np.isin(codes, _STRUCTURAL_CODES) | quotes
+    return np.flatnonzero(structural & outside).tolist()
+
+
+# The scan used for large inputs is picked once, at import, from what this
+# environment supports; _impl_name records the choice for debugging.
+if np is not None:
+    _large_input_scan = _structural_indices_numpy
+    _impl_name = "numpy"
+else:
+    _large_input_scan = _structural_indices_regex
+    _impl_name = "regex"
@@ -10,7 +10,12 @@ from exceptions import (
     UnexpectedTokenException,
     UnterminatedStringException,
 )
-from parser import Parser, loads
+from chunked import ChunkedParser, parse_chunked
+from lazy import LazyJsonArray, LazyJsonObject, loads_lazy
+from models import JSON_FALSE, JSON_NULL, JSON_TRUE, JsonArray, JsonObject
+from parser import Parser, fast_loads, loads
+import structural
+from structural import structural_indices
 from tokenizer import Tokenizer, TokenType
 
 
@@ -35,6 +40,13 @@ class TestJsonParser(unittest.TestCase):
         self.assertEqual(loads(r'"\uabcd"'), "\uabcd")
         self.assertEqual(loads(r'"\u0024"'), "$")  # Dollar sign
 
+    def test_parse_string_mixed_escapes(self):
+        # Escaped strings are decoded in bulk; check the cases where JSON and
+        # Python escapes differ, next to non-Latin-1 text.
+        self.assertEqual(loads(r'"a\\/b\/c \\\\ caf\u00e9 日本 \ud83d\ude00 \"q\""'),
+                         'a\\/b/c \\\\ café 日本 \ud83d\ude00 "q"')
+        self.assertEqual(loads('"\\u00e9\u00e9 \\t"'), "\u00e9\u00e9 \t")
+
     def test_parse_number(self):
         self.assertEqual(loads("123"), 123)
         self.assertEqual(loads("-123"), -123)
@@ -47,6 +59,9 @@ class TestJsonParser(unittest.TestCase):
         self.assertEqual(loads("1e-10"), 1e-10)
         self.assertEqual(loads("1.23e+5"), 1.23e5)
         self.assertEqual(loads("-1.23e-5"), -1.23e-5)
+        self.assertIs(type(loads("-123")), int)
+        self.assertIs(type(loads("1e2")), float)
+        self.assertIs(type(loads("1.0")), float)
 
     def test_parse_boolean(self):
         self.assertEqual(loads("true"), True)
@@ -165,6 +180,10 @@ class TestJsonParser(unittest.TestCase):
             loads("0.0.1")  # multiple decimal points
         with self.assertRaisesRegex(InvalidNumberException, r"Invalid number format: '1\.e'"):
             loads("1.e")  # missing digits after e
+        with self.assertRaisesRegex(MalformedJsonException, r"Unexpected character: '\u0663'"):
+            loads("\u0663")  # non-ASCII digits are not JSON digits
+        with self.assertRaisesRegex(MalformedJsonException, r"column 2: Unexpected character"):
+            loads("1\u0663")
         with self.assertRaisesRegex(InvalidNumberException, r"Invalid number format: '1e\+'"):
             loads("1e+")  # missing digits after +
         with self.assertRaisesRegex(InvalidNumberException, r"Invalid number format: '1e\-'"):
@@ -217,6 +236,136 @@ class TestJsonParser(unittest.TestCase):
         }
         self.assertEqual(loads(json_str), expected)
 
+    def test_parse_returns_json_value_tree(self):
+        value = Parser('{"a": [1, "x", true, null]}').parse()
+        self.assertIsInstance(value, JsonObject)
+        self.assertIsInstance(value["a"], JsonArray)
+        self.assertIs(value["a"][3], JSON_NULL)
+        self.assertEqual(value.to_native(), {"a": [1, "x", True, None]})
+
+    def test_parse_reuses_boolean_and_small_int_instances(self):
+        value = Parser("[true, true, false, 7, 7, 1000, 1000, 7.0]").parse()
+        self.assertIs(value[0], JSON_TRUE)
+        self.assertIs(value[1], JSON_TRUE)
+        self.assertIs(value[2], JSON_FALSE)
+        self.assertIs(value[3], value[4])
+        self.assertIsNot(value[5], value[6])
+        self.assertIsInstance(value[7].to_native(), float)
+
+    def test_parse_deeply_nested_input(self):
+        depth = 10000
+        native = loads("[" * depth + '{"k": null}' + "]" * depth)
+        for _ in range(depth):
+            native = native[0]
+        self.assertEqual(native, {"k": None})
+
+    def test_json_value_structural_equality(self):
+        left = Parser('{"a": [1, "x", {"b": null}], "c": true}').parse()
+        right = Parser('{"c": true, "a": [1.0, "x", {"b": null}]}').parse()
+        self.assertEqual(left, right)
+        self.assertEqual(hash(left), hash(right))
+        self.assertNotEqual(left, Parser('{"a": [1, "x", {"b": false}], "c": true}').parse())
+        self.assertNotEqual(Parser("[1]").parse(), Parser("[true]").parse())
+        self.assertEqual(len({left, right}), 1)
+
+    def test_to_native_handles_deep_nesting(self):
+        depth = 5000
+        value = JsonArray([])
+        for _ in range(depth):
+            value = JsonArray([value, JsonObject({"k": JSON_NULL})])
+        native = value.to_native()
+        for _ in range(depth):
+            self.assertEqual(native[1], {"k": None})
+            native = native[0]
+        self.assertEqual(native, [])
+
+    def test_loads_lazy_decodes_only_accessed_members(self):
+        doc = loads_lazy('{"courses": [{"title": "A, [b]"}, {"n": 1}], "skip": [1, , 3], "tail": 2}')
+        self.assertIsInstance(doc, LazyJsonObject)
+        self.assertIsInstance(doc["courses"], LazyJsonArray)
+        self.assertEqual(doc["courses"][0]["title"], "A, [b]")
+        self.assertEqual(doc["courses"][1].to_native(), {"n": 1})
+        self.assertEqual(doc["tail"], 2)
+        # The malformed "skip" member is only reported once it is decoded.
+        with self.assertRaises(MalformedJsonException):
+            doc["skip"][1]
+        with self.assertRaisesRegex(MalformedJsonException, r"Extra data after JSON document"):
+            loads_lazy('{"a": 1} [2]')
+
+        # Plain strings are sliced out; escaped ones still go through loads().
+        doc = loads_lazy('{"plain" : "x", "esc\\n": "a\\"b", "bad": "\\q"}')
+        self.assertEqual(doc.keys(), ["plain", "esc\n", "bad"])
+        self.assertEqual(doc["plain"], "x")
+        self.assertEqual(doc["esc\n"], 'a"b')
+        with self.assertRaisesRegex(InvalidStringException, r"Invalid escape sequence"):
+            doc["bad"]
+
+    def test_chunked_parser_emits_elements_as_they_complete(self):
+        parser = ChunkedParser()
+        self.assertEqual(parser.push('[{"a": "x,]'), [])
+        self.assertEqual(parser.push('"}, 2'), [{"a": "x,]"}])
+        self.assertEqual(parser.push(", [3]]".encode()), [2, [3]])
+        self.assertEqual(parser.finish(), [])
+
+        data = '["\u00e9€", 1]'.encode()
+        chunks = [data[i:i + 1] for i in range(len(data))]
+        self.assertEqual(list(parse_chunked(chunks)), ["é€", 1])
+        self.assertEqual(list(parse_chunked(['{"a": 1}\n[1,', " 2]\n"], mode="lines")), [{"a": 1}, [1, 2]])
+
+    def test_chunked_parser_reports_stream_positions(self):
+        with self.assertRaisesRegex(UnexpectedTokenException, r"line 3, column 8: Expected COLON"):
+            list(parse_chunked(["[\n  1,\n", '  {"a" 1}]']))
+        with self.assertRaisesRegex(MalformedJsonException, r"Trailing comma not allowed in array"):
+            list(parse_chunked(["[1, 2,", "]"]))
+        with self.assertRaisesRegex(UnexpectedEndOfInputException, r"expected ',' or '\]'"):
+            list(parse_chunked(["[1, 2"]))
+        with self.assertRaisesRegex(UnexpectedTokenException, r"line 1, column 6: Expected '\]', but found '\}'"):
+            list(parse_chunked(["[1, 2}"]))
+        with self.assertRaisesRegex(UnexpectedTokenException, r"Expected '\]', but found '\}'"):
+            list(parse_chunked(["[1, ", "{", "}}"]))
+        with self.assertRaises(MalformedJsonException):
+            list(parse_chunked(["[1, {]}"]))
+
+    def test_object_keys_are_interned(self):
+        first, second = loads('[{"name": 1}, {"name": 2}]')
+        self.assertIs(next(iter(first)), next(iter(second)))
+        # Short string values are shared too, across documents.
+        self.assertIs(loads('["active"]')[0], loads('{"status": "active"}')["status"])
+
+    def test_fast_loads_matches_loads(self):
+        json_str = '{"a": [1, 2.5, "x", true, false, null], "b": {"c": "\\u00A9"}}'
+        self.assertEqual(fast_loads(json_str), loads(json_str))
+        with self.assertRaises(ValueError):
+            fast_loads('{"a": 1,')
+        for big in ("123456789012345678901234567890", "-9223372036854775809", "18446744073709551616"):
+            self.assertEqual(fast_loads(f'[{big}, 1.5]'), [int(big), 1.5])
+            self.assertIsInstance(fast_loads(big), int)
+        self.assertEqual(loads(json_str, strict_errors=False), loads(json_str))
+        self.assertEqual(loads('{"a": 1, "a": 2}', strict_errors=False), {"a": 2})
+        big = "[123456789012345678901234567890, -9223372036854775809]"
+        self.assertEqual(loads(big, strict_errors=False), loads(big))
+        self.assertEqual(loads(big, strict_errors=False), [123456789012345678901234567890, -9223372036854775809])
+
+    def test_structural_indices_skip_string_contents(self):
+        json_str = '{"a,b": [1, "}{"], "c": 2}'
+        self.assertEqual(
+            [json_str[i] for i in structural_indices(json_str)],
+            ["{", '"', ":", "[", ",", '"', "]", ",", '"', ":", "}"],
+        )
+        self.assertEqual(structural_indices(r'["\\", "\""]'), [0, 1, 5, 7, 11])
+
+    @unittest.skipIf(structural.np is None, "NumPy is not installed")
+    def test_structural_indices_numpy_matches_regex(self):
+        json_str = '[' + ', '.join(
+            '{"id": %d, "s": "a\\\\\\"b,[c]", "t": "\u00e9"}' % i for i in range(500)
+        ) + ']'
+        self.assertGreaterEqual(len(json_str), structural.NUMPY_MIN_LENGTH)
+        self.assertEqual(structural._impl_name, "numpy")
+        self.assertEqual(
+            structural._structural_indices_numpy(json_str),
+            structural._structural_indices_regex(json_str),
+        )
+
     def test_tokenizer_edge_cases(self):
         # Test a simple string with an escaped quote
         tokenizer = Tokenizer(r'{"k": "value with \" quote"}')
@@ -229,6 +378,7 @@ class TestJsonParser(unittest.TestCase):
         self.assertEqual(tokens[3].value, 'value with " quote')
         self.assertEqual(tokens[4].type, TokenType.RIGHT_BRACE)
         self.assertEqual(tokens[5].type, TokenType.EOF)
+        self.assertIsInstance(Tokenizer("[1, 2]").tokenize(), list)
 
         with self.assertRaisesRegex(UnterminatedStringException, r"Unterminated string literal"):
             list(Tokenizer('"abc').tokenize())
@@ -236,6 +386,85 @@ class TestJsonParser(unittest.TestCase):
         with self.assertRaisesRegex(InvalidStringException, r"Invalid unicode escape sequence"):
             list(Tokenizer(r'"\uZZZZ"').tokenize())
 
+    def test_whitespace(self):
+        self.assertEqual(loads(' \t\r\n[\n    1,\r\n\t2\n]\n '), [1, 2])
+        with self.assertRaisesRegex(UnexpectedTokenException, r"line 3, column 5: Expected ',' or '\]'"):
+            loads('[\n    1\n    2]')
+        # Only the four JSON whitespace characters separate tokens.
+        with self.assertRaisesRegex(MalformedJsonException, r"Unexpected character"):
+            loads('\x0c1')
+
+    def test_token_positions(self):
+        # Plain tokens are matched in bulk and escaped strings fall back to the
+        # character-level reader; positions must agree across both paths.
+        tokens = list(Tokenizer('{"a": [1, -2.5e3],\n  "b\\n": true,\n "c": null}').tokenize())
+        self.assertEqual(
+            [(t.type, t.value, t.line, t.column) for t in tokens],
+            [
+                (TokenType.LEFT_BRACE, None, 1, 1),
+                (TokenType.STRING, "a", 1, 2),
+                (TokenType.COLON, None, 1, 5),
+                (TokenType.LEFT_BRACKET, None, 1, 7),
+                (TokenType.NUMBER, 1, 1, 8),
+                (TokenType.COMMA, None, 1, 9),
+                (TokenType.NUMBER, -2500.0, 1, 11),
+                (TokenType.RIGHT_BRACKET, None, 1, 17),
+                (TokenType.COMMA, None, 1, 18),
+                (TokenType.STRING, "b\n", 2, 3),
+                (TokenType.COLON, None, 2, 8),
+                (TokenType.TRUE, True, 2, 10),
+                (TokenType.COMMA, None, 2, 14),
+                (TokenType.STRING, "c", 3, 2),
+                (TokenType.COLON, None, 3, 5),
+                (TokenType.NULL, None, 3, 7),
+                (TokenType.RIGHT_BRACE, None, 3, 11),
+                (TokenType.EOF, None, 3, 12),
+            ],
+        )
+
+    def test_tokenize_into_columns(self):
+        tokenizer = Tokenizer('[1,\n "a\\"", null]')
+        types: list = []
+        values: list = []
+        offsets: list = []
+        tokenizer.tokenize_into(types, values, offsets)
+        self.assertEqual(
+            types,
+            [TokenType.LEFT_BRACKET, TokenType.NUMBER, TokenType.COMMA, TokenType.STRING,
+             TokenType.COMMA, TokenType.NULL, TokenType.RIGHT_BRACKET, TokenType.EOF],
+        )
+        self.assertEqual(values, [None, 1, None, 'a"', None, None, None, None])
+        self.assertEqual(offsets, [0, 1, 2, 5, 10, 12, 16, 17])
+        self.assertEqual(tokenizer.location(5), (2, 2))
+
+        # Tokens before a lexical error are kept.
+        types, values, offsets = [], [], []
+        with self.assertRaises(UnterminatedStringException):
+            Tokenizer('[1, "ab').tokenize_into(types, values, offsets)
+        self.assertEqual(values, [None, 1, None])
+
+    def test_string_runs_and_escape_positions(self):
+        # Literal runs are copied in bulk between escapes.
+        tokens = list(Tokenizer(r'["plain", "a\tb\\céd", ""]').tokenize())
+        self.assertEqual([t.value for t in tokens[1:6:2]], ["plain", "a\tb\\céd", ""])
+        self.assertEqual(tokens[3].column, 11)
+        self.assertEqual(tokens[4].column, 22)
+
+        with self.assertRaisesRegex(InvalidStringException, r"line 2, column 7: Invalid escape sequence: \\q"):
+            list(Tokenizer('\n ["ab\\q"]').tokenize())
+        with self.assertRaisesRegex(InvalidStringException, r"line 1, column 4: Invalid escape sequence"):
+            list(Tokenizer('"a\\\nb"').tokenize())
+
+    def test_string_control_characters(self):
+        # Raw control characters must be escaped inside a string.
+        with self.assertRaisesRegex(InvalidStringException, r"column 3: Invalid control character"):
+            loads('"a\tb"')
+        with self.assertRaisesRegex(InvalidStringException, r"column 8: Invalid control character"):
+            loads('["x", "\x01"]')
+        with self.assertRaises(UnterminatedStringException):
+            loads('"a\nb"')
+        self.assertEqual(loads('"a\\tb"'), "a\tb")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
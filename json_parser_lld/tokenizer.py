@@ -1,6 +1,7 @@
+import codecs
 import re
 from enum import Enum, auto
-from typing import Any, Generator, NamedTuple, Tuple, Union
+from typing import Any, Dict, List, NamedTuple, Tuple, Union
 
 from exceptions import (
     InvalidNumberException,
@@ -10,6 +11,64 @@ from exceptions import (
     UnterminatedStringException,
 )
 
+# Strict JSON number (no leading zeros for non-zero numbers, etc.), which
+# must not run on into more number characters ("01", "1.e"). The optional
+# fraction and exponent are the only groups, so match.lastindex is None
+# exactly when the number is an integer.
+_NUMBER_PATTERN = re.compile(
+    r"-?(?:0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?(?![\d.eE+-])", re.ASCII
+)
+# Every character that can appear in a number, valid or not. When there is no
+# valid number, the longest run of them is reported as one invalid number.
+_NUMBER_CHARS = re.compile(r"[\d.eE+-]*", re.ASCII)
+# Characters a number can start with. Set membership is one hash lookup, and
+# unlike str.isdigit() it does not accept non-ASCII digits.
+_NUMBER_START = frozenset("-0123456789")
+# Insignificant whitespace, as defined by the JSON grammar.
+_WHITESPACE = re.compile(r"[ \t\n\r]+")
+_WHITESPACE_CHARS = frozenset(" \t\n\r")
+# Characters that end a run of literal string content: the closing quote, an
+# escape, or a raw control character (which JSON does not allow in a string).
+_STRING_STOP = re.compile(r'["\\\x00-\x1f]')
+# The character each single-character escape stands for (\uXXXX is separate).
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_HEX_ESCAPE = re.compile(r"[0-9a-fA-F]{4}")
+# The body of a string literal whose escapes are all valid.
+_ESCAPED_STRING_BODY = re.compile(r'(?:[^"\\\x00-\x1f]+|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*')
+
+# Leading whitespace plus one common, complete token. Exactly one group
+# matches, and its number (match.lastindex) identifies the kind of token.
+# Numbers must not run on into more number characters and strings must not
+# contain escapes; those cases fall back to the character-level readers.
+_TOKEN = re.compile(
+    r"""[ \t\n\r]*(?:
+        ([{}\[\]:,])
+        | ("[^"\\\x00-\x1f]*")
+        | (-?(?:0|[1-9][0-9]*))(?![0-9.eE+-])
+        | (-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)(?![0-9.eE+-])
+        | (true) | (false) | (null)
+    )""",
+    re.VERBOSE,
+)
+_STRUCTURAL, _PLAIN_STRING, _INTEGER, _FLOAT, _TRUE, _FALSE, _NULL = range(1, 8)
+
+# Short strings recently seen by any tokenizer, each mapped to itself. Documents
+# repeat the same few keys ("id", "name", ...) and enum-like values, so every
+# occurrence shares one str object: less memory, and dict lookups on keys
+# short-circuit on identity. Cleared when full to keep it bounded.
+_STRING_CACHE: Dict[str, str] = {}
+_STRING_CACHE_SIZE = 2048
+_CACHED_STRING_MAX_LENGTH = 64
+
 
 class TokenType(Enum):
     LEFT_BRACE = auto()  # {
@@ -32,205 +91,278 @@ class Token(NamedTuple):
     line: int
     column: int
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         if self.type in (TokenType.STRING, TokenType.NUMBER):
             return f"Token({self.type.name}, {repr(self.value)}, line={self.line}, col={self.column})"
         return f"Token({self.type.name}, line={self.line}, col={self.column})"
 
 
+# Token type of each structural character, shared by both tokenizing paths.
+_STRUCTURAL_TYPES = {
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    "[": TokenType.LEFT_BRACKET,
+    "]": TokenType.RIGHT_BRACKET,
+    ":": TokenType.COLON,
+    ",": TokenType.COMMA,
+}
+
+# Token type and value for each keyword group of _TOKEN.
+_KEYWORD_TOKENS = {
+    _TRUE: (TokenType.TRUE, True),
+    _FALSE: (TokenType.FALSE, False),
+    _NULL: (TokenType.NULL, None),
+}
+
+# Keyword text, token type and value by first character, for the
+# character-level path: one lookup picks the only keyword that can match.
+_KEYWORDS = {
+    "t": ("true", TokenType.TRUE, True),
+    "f": ("false", TokenType.FALSE, False),
+    "n": ("null", TokenType.NULL, None),
+}
+
+
 class Tokenizer:
     def __init__(self, json_string: str):
         self.json_string = json_string
+        # Only the offset is tracked while reading; line and column are
+        # worked out from it with location() when they are actually needed.
         self.pos = 0
-        self.line = 1
-        self.column = 1
         self.length = len(json_string)
 
-    def _advance(self, count: int = 1):
-        for _ in range(count):
-            if self.pos < self.length:
-                if self.json_string[self.pos] == "\n":
-                    self.line += 1
-                    self.column = 1
-                else:
-                    self.column += 1
-                self.pos += 1
-            else:
-                break
-
-    def _peek(self, count: int = 1) -> str:
-        if self.pos + count - 1 < self.length:
-            return self.json_string[self.pos + count - 1]
-        return ""
+    def _skip_whitespace(self) -> None:
+        # Most tokens are not preceded by whitespace, so only run the regex
+        # when there is a run to skip; it then consumes it in one C-level call.
+        json_string, pos = self.json_string, self.pos
+        if json_string[pos : pos + 1] in _WHITESPACE_CHARS:
+            whitespace = _WHITESPACE.match(json_string, pos)
+            assert whitespace is not None
+            self.pos = whitespace.end()
 
-    def _read_char(self) -> str:
-        if self.pos < self.length:
-            char = self.json_string[self.pos]
-            self._advance()
-            return char
-        return ""
+    def _read_string(self) -> str:
+        start = self.pos
+        json_string = self.json_string
+        pos = start + 1  # Skip the opening quote
 
-    def _skip_whitespace(self):
-        while self.pos < self.length and self.json_string[self.pos].isspace():
-            self._advance()
-
-    def _read_string(self) -> Token:
-        start_pos = self.pos
-        start_column = self.column
-        start_line = self.line
-        self._advance()  # Consume the opening quote
+        # A well-formed string is validated by one regex match and decoded in
+        # bulk by the unicode_escape codec, whose escapes are a superset of
+        # JSON's once "\\" and "\/" are rewritten. The loop below only runs
+        # to report the exact error in a malformed string.
+        body = _ESCAPED_STRING_BODY.match(json_string, pos)
+        assert body is not None  # the pattern also matches the empty string
+        body_end = body.end()
+        if json_string.startswith('"', body_end):
+            raw = json_string[pos:body_end].replace("\\\\", "\\x5c").replace("\\/", "/")
+            self.pos = body_end + 1
+            return codecs.decode(raw.encode("latin-1", "backslashreplace"), "unicode_escape")
 
+        # Copy each run of ordinary characters with one slice, found by a
+        # single regex search, instead of appending it character by character.
         value_chars = []
-        while self.pos < self.length:
-            char = self._read_char()
-            if char == "\\":
-                # Handle escape sequences
-                if self.pos >= self.length:
-                    raise UnterminatedStringException(start_line, start_column)
-                escape_char = self._read_char()
-                if escape_char == '"':
-                    value_chars.append('"')
-                elif escape_char == "\\":
-                    value_chars.append("\\")
-                elif escape_char == "/":
-                    value_chars.append("/")
-                elif escape_char == "b":
-                    value_chars.append("\b")
-                elif escape_char == "f":
-                    value_chars.append("\f")
-                elif escape_char == "n":
-                    value_chars.append("\n")
-                elif escape_char == "r":
-                    value_chars.append("\r")
-                elif escape_char == "t":
-                    value_chars.append("\t")
-                elif escape_char == "u":
-                    # Unicode escape sequence \uXXXX
-                    if self.pos + 4 > self.length:
-                        raise InvalidStringException(
-                            "Invalid unicode escape sequence", self.line, self.column
-                        )
-                    hex_digits = self.json_string[self.pos : self.pos + 4]
-                    if not re.fullmatch(r"[0-9a-fA-F]{4}", hex_digits):
-                        raise InvalidStringException(
-                            "Invalid unicode escape sequence", self.line, self.column
-                        )
-                    self._advance(4)
-                    try:
-                        value_chars.append(chr(int(hex_digits, 16)))
-                    except ValueError as e:
-                        raise InvalidStringException(
-                            f"Invalid unicode character: {e}", self.line, self.column
-                        )
-                else:
-                    raise InvalidStringException(
-                        f"Invalid escape sequence: \\{escape_char}",
-                        self.line,
-                        self.column - 1,
-                    )
-            elif char == '"':
-                return Token(
-                    TokenType.STRING,
-                    "".join(value_chars),
-                    start_line,
-                    start_column,
-                )
+        while True:
+            stop = _STRING_STOP.search(json_string, pos)
+            if stop is None:
+                raise UnterminatedStringException(*self.location(start))
+            end = stop.start()
+            if end > pos:
+                value_chars.append(json_string[pos:end])
+            char = json_string[end]
+            if char == '"':
+                pos = end + 1
+                break
             elif char == "\n":
                 # Unescaped newline in string
-                raise UnterminatedStringException(start_line, start_column)
-            else:
-                value_chars.append(char)
-
-        raise UnterminatedStringException(start_line, start_column)
-
-    def _read_number(self) -> Token:
-        start_pos = self.pos
-        start_column = self.column
-        start_line = self.line
-
-        # Find the end of the potential number string
-        temp_pos = self.pos
-        while temp_pos < self.length and (self.json_string[temp_pos].isdigit() or
-                                          self.json_string[temp_pos] in ".-+eE"):
-            temp_pos += 1
-        
-        number_str_potential = self.json_string[self.pos:temp_pos]
-
-        # Strict JSON number pattern (no leading zeros for non-zero numbers, etc.)
-        number_pattern = r"^-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?$"
-        
-        match = re.fullmatch(number_pattern, number_str_potential)
-
-        if not match:
-            # If the extracted potential string does not fully match a valid JSON number pattern
-            raise InvalidNumberException(number_str_potential, start_line, start_column)
-
-        number_str = match.group(0)
-        self._advance(len(number_str))
-
-        try:
-            if "." in number_str or "e" in number_str.lower():
-                value = float(number_str)
-            else:
-                value = int(number_str)
-            return Token(TokenType.NUMBER, value, start_line, start_column)
-        except ValueError:
-            # This should ideally not be reached if regex and conversion are correct, but as a safeguard.
-            raise InvalidNumberException(number_str, start_line, start_column)
-
-    def _read_keyword(self, keyword: str, token_type: TokenType) -> Token:
-        start_column = self.column
-        start_line = self.line
-        if self.json_string.startswith(keyword, self.pos):
-            self._advance(len(keyword))
-            return Token(token_type, None, start_line, start_column)
-        return None  # Indicate not found
-
-    def tokenize(self) -> Generator[Token, None, None]:
-        while self.pos < self.length:
-            self._skip_whitespace()
-
-            if self.pos >= self.length:
-                break
+                raise UnterminatedStringException(*self.location(start))
+            elif char != "\\":
+                raise InvalidStringException(
+                    f"Invalid control character in string: {char!r}", *self.location(end)
+                )
 
-            char = self.json_string[self.pos]
-            start_column = self.column
-            start_line = self.line
-
-            if char == "{":
-                self._advance()
-                yield Token(TokenType.LEFT_BRACE, None, start_line, start_column)
-            elif char == "}":
-                self._advance()
-                yield Token(TokenType.RIGHT_BRACE, None, start_line, start_column)
-            elif char == "[":
-                self._advance()
-                yield Token(TokenType.LEFT_BRACKET, None, start_line, start_column)
-            elif char == "]":
-                self._advance()
-                yield Token(TokenType.RIGHT_BRACKET, None, start_line, start_column)
-            elif char == ":":
-                self._advance()
-                yield Token(TokenType.COLON, None, start_line, start_column)
-            elif char == ",":
-                self._advance()
-                yield Token(TokenType.COMMA, None, start_line, start_column)
-            elif char == '"':
-                yield self._read_string()
-            elif char == "-" or char.isdigit():
-                yield self._read_number()
-            elif self.json_string.startswith("true", self.pos):
-                self._advance(4)
-                yield Token(TokenType.TRUE, True, start_line, start_column)
-            elif self.json_string.startswith("false", self.pos):
-                self._advance(5)
-                yield Token(TokenType.FALSE, False, start_line, start_column)
-            elif self.json_string.startswith("null", self.pos):
-                self._advance(4)
-                yield Token(TokenType.NULL, None, start_line, start_column)
+            # Handle escape sequences
+            escape_char = json_string[end + 1 : end + 2]
+            if not escape_char:
+                raise UnterminatedStringException(*self.location(start))
+            pos = end + 2
+            unescaped = _ESCAPES.get(escape_char)
+            if unescaped is not None:
+                value_chars.append(unescaped)
+            elif escape_char == "u":
+                # Unicode escape sequence \uXXXX
+                hex_digits = json_string[pos : pos + 4]
+                if not _HEX_ESCAPE.fullmatch(hex_digits):
+                    raise InvalidStringException(
+                        "Invalid unicode escape sequence", *self.location(pos)
+                    )
+                pos += 4
+                value_chars.append(chr(int(hex_digits, 16)))
             else:
-                raise MalformedJsonException(
-                    f"Unexpected character: '{char}'", start_line, start_column
+                raise InvalidStringException(
+                    f"Invalid escape sequence: \\{escape_char}", *self.location(end + 1)
                 )
 
-        yield Token(TokenType.EOF, None, self.line, self.column)
\ No newline at end of file
+        self.pos = pos
+        return "".join(value_chars)
+
+    def _read_number(self) -> Union[int, float]:
+        start = self.pos
+        json_string = self.json_string
+
+        # Match the number where it stands: one anchored regex match
+        # validates it, checks what follows and finds its end, and the value
+        # is converted from a single slice of the input.
+        match = _NUMBER_PATTERN.match(json_string, start)
+        if match is None:
+            # Report the whole run of number characters as one invalid number.
+            run = _NUMBER_CHARS.match(json_string, start)
+            assert run is not None  # the pattern also matches the empty string
+            raise InvalidNumberException(
+                json_string[start : run.end()], *self.location(start)
+            )
+        end = self.pos = match.end()
+
+        # Integer fast path: the regex already told us whether a fraction or
+        # exponent is present, so plain integers skip float parsing entirely.
+        if match.lastindex is None:
+            return int(json_string[start:end])
+        return float(json_string[start:end])
+
+    def _next_token(self) -> Tuple[TokenType, Any]:
+        """
+        Reads the (type, value) of the token at the current offset, which
+        must not be whitespace, character by character: handles every case
+        (escapes, errors, end of input) with precise error positions.
+        """
+        json_string, pos = self.json_string, self.pos
+        if pos >= self.length:
+            return TokenType.EOF, None
+
+        char = json_string[pos]
+
+        # One table lookup covers all six structural characters.
+        structural_type = _STRUCTURAL_TYPES.get(char)
+        if structural_type is not None:
+            self.pos = pos + 1
+            return structural_type, None
+        elif char == '"':
+            return TokenType.STRING, self._read_string()
+        elif char in _NUMBER_START:
+            return TokenType.NUMBER, self._read_number()
+
+        keyword = _KEYWORDS.get(char)
+        if keyword is not None:
+            text, token_type, value = keyword
+            if json_string.startswith(text, pos):
+                self.pos = pos + len(text)
+                return token_type, value
+        raise MalformedJsonException(
+            f"Unexpected character: '{char}'", *self.location(pos)
+        )
+
+    def location(self, offset: int) -> Tuple[int, int]:
+        """
+        Returns the (line, column) of a character offset. Computed on demand
+        by scanning back for newlines, so callers that only need positions
+        for error messages pay for it only when raising.
+        """
+        line_start = self.json_string.rfind("\n", 0, offset) + 1
+        return self.json_string.count("\n", 0, offset) + 1, offset - line_start + 1
+
+    def tokenize_into(
+        self, types: List[TokenType], values: List[Any], offsets: List[int]
+    ) -> None:
+        """
+        Appends every token, ending with EOF, as parallel columns: its type,
+        its decoded value and the offset where it starts. No Token object is
+        built and no line/column is computed; see location().
+
+        Each common token (with the whitespace before it) is recognized by one
+        match of _TOKEN, so the per-character work happens inside the regex
+        engine. Anything _TOKEN does not cover (strings with escapes, invalid
+        input, the end of input) goes through _next_token(). A lexical error
+        propagates after the tokens before it have been appended.
+        """
+        json_string = self.json_string
+        token_match = _TOKEN.match
+        add_type, add_value, add_offset = types.append, values.append, offsets.append
+        # The tables and enum members the loop below uses per token are bound
+        # to locals up front rather than looked up on every token.
+        string_cache = _STRING_CACHE
+        structural_types = _STRUCTURAL_TYPES
+        keyword_tokens = _KEYWORD_TOKENS
+        string_type = TokenType.STRING
+        number_type = TokenType.NUMBER
+        pos = self.pos
+        while True:
+            match = token_match(json_string, pos)
+            if match is None:
+                self.pos = pos
+                self._skip_whitespace()
+                start = self.pos
+                token_type, value = self._next_token()
+                add_offset(start)
+                add_type(token_type)
+                add_value(value)
+                if token_type == TokenType.EOF:
+                    return
+                pos = self.pos
+                continue
+
+            kind = match.lastindex
+            assert kind is not None  # every alternative is a group
+            start = match.start(kind)
+            pos = match.end()
+            add_offset(start)
+            if kind == _STRUCTURAL:
+                add_type(structural_types[json_string[start]])
+                add_value(None)
+            elif kind == _PLAIN_STRING:
+                add_type(string_type)
+                value = json_string[start + 1 : pos - 1]
+                if pos - start <= _CACHED_STRING_MAX_LENGTH + 2:
+                    cached = string_cache.get(value)
+                    if cached is None:
+                        if len(string_cache) >= _STRING_CACHE_SIZE:
+                            string_cache.clear()
+                        string_cache[value] = value
+                    else:
+                        value = cached
+                add_value(value)
+            elif kind == _INTEGER:
+                add_type(number_type)
+                add_value(int(json_string[start:pos]))
+            elif kind == _FLOAT:
+                add_type(number_type)
+                add_value(float(json_string[start:pos]))
+            else:
+                keyword_type, keyword_value = keyword_tokens[kind]
+                add_type(keyword_type)
+                add_value(keyword_value)
+
+    def tokenize(self) -> List[Token]:
+        """
+        Returns every token, ending with EOF, as a list of Token objects with
+        their line and column. The input is tokenized in one go, so a lexical
+        error is raised before any token is returned; use tokenize_into() to
+        keep the tokens that precede it.
+        """
+        types: List[TokenType] = []
+        values: List[Any] = []
+        offsets: List[int] = []
+        json_string = self.json_string
+        line, column = self.location(self.pos)
+        line_start = self.pos - column + 1
+        counted = self.pos
+        self.tokenize_into(types, values, offsets)
+        # Offsets only increase and tokens never contain a raw newline, so
+        # positions are found with one incremental pass.
+        tokens: List[Token] = []
+        append = tokens.append
+        for token_type, value, offset in zip(types, values, offsets):
+            newlines = json_string.count("\n", counted, offset)
+            if newlines:
+                line += newlines
+                line_start = json_string.rfind("\n", counted, offset) + 1
+            counted = offset
+            append(Token(token_type, value, line, offset - line_start + 1))
+        return tokens
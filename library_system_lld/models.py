@@ -1,53 +1,58 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from datetime import date
+from typing import Dict
 
-# Using forward declarations as strings for type hints to avoid circular imports
-from typing import List, TYPE_CHECKING
-if TYPE_CHECKING:
-    from observers import Observer
+from observers import Observer
 
 class BookStatus(Enum):
     AVAILABLE = auto()
     LOANED = auto()
     RESERVED = auto()
 
-@dataclass
+@dataclass(slots=True)
 class Book:
     """The abstract representation of a book (the Subject in the Observer pattern)."""
     isbn: str
     title: str
     author: str
-    _observers: List[Observer] = field(default_factory=list, repr=False)
+    # Keyed by observer_id: O(1) add and remove, in registration order.
+    _observers: Dict[str, Observer] = field(default_factory=dict, repr=False)
 
     def add_observer(self, observer: Observer) -> None:
-        self._observers.append(observer)
+        self._observers[observer.observer_id] = observer
 
     def remove_observer(self, observer: Observer) -> None:
-        self._observers.remove(observer)
+        self._observers.pop(observer.observer_id, None)
 
     def notify_observers(self) -> None:
         print(f"Notifying {len(self._observers)} observers for '{self.title}'...")
-        for observer in self._observers:
-            observer.update(self)
+        # Collect each observer's notification and write them out in one call.
+        messages = [observer.update(self) for observer in self._observers.values()]
+        if messages:
+            print("\n".join(messages))
 
-@dataclass
+@dataclass(slots=True)
 class BookCopy:
     """A specific physical copy of a book."""
     copy_id: str
     book: Book
     status: BookStatus = BookStatus.AVAILABLE
 
-@dataclass
-class Member:
+@dataclass(slots=True)
+class Member(Observer):
     """A library member (the Observer in the Observer pattern)."""
     member_id: str
     name: str
 
-    def update(self, book: Book) -> None:
-        print(f"  - Notification for Member {self.name}: Book '{book.title}' is now available!")
+    @property
+    def observer_id(self) -> str:
+        return self.member_id
 
-@dataclass
+    def update(self, book: Book) -> str:
+        return f"  - Notification for Member {self.name}: Book '{book.title}' is now available!"
+
+@dataclass(slots=True)
 class Loan:
     """Links a member to a book copy."""
     member: Member
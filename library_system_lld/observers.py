@@ -5,8 +5,17 @@ if TYPE_CHECKING:
     from models import Book
 
 class Observer(ABC):
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def observer_id(self) -> str:
+        """Identifies the observer; a subject holds each one at most once."""
+        pass
+
     @abstractmethod
-    def update(self, book: Book) -> None:
+    def update(self, book: "Book") -> str:
+        """Returns the notification for this observer; the subject delivers it."""
         pass
 
 class Subject(ABC):
@@ -1,3 +1,4 @@
+from collections import defaultdict, deque
 from datetime import date
 from models import Book, BookCopy, Member, Loan, BookStatus
 from policies import BorrowingPolicy
@@ -8,18 +9,32 @@ class CatalogService:
     def __init__(self):
         self.books: dict[str, Book] = {}
         self.copies: dict[str, BookCopy] = {}
+        # Secondary index: the AVAILABLE copies of each ISBN, so a checkout
+        # does not have to scan every copy in the catalog.
+        self._available_by_isbn: defaultdict[str, deque[BookCopy]] = defaultdict(deque)
 
     def add_book_copy(self, book: Book, copy_id: str):
         if book.isbn not in self.books:
             self.books[book.isbn] = book
         copy = BookCopy(copy_id=copy_id, book=book)
         self.copies[copy_id] = copy
+        self._available_by_isbn[book.isbn].append(copy)
 
     def find_available_copy(self, isbn: str) -> BookCopy | None:
-        for copy in self.copies.values():
-            if copy.book.isbn == isbn and copy.status == BookStatus.AVAILABLE:
-                return copy
-        return None
+        available = self._available_by_isbn.get(isbn)
+        return available[0] if available else None
+
+    def mark_loaned(self, copy: BookCopy) -> None:
+        available = self._available_by_isbn[copy.book.isbn]
+        if available and available[0] is copy:
+            available.popleft()  # The copy find_available_copy() handed out
+        else:
+            available.remove(copy)
+        copy.status = BookStatus.LOANED
+
+    def mark_available(self, copy: BookCopy) -> None:
+        self._available_by_isbn[copy.book.isbn].append(copy)
+        copy.status = BookStatus.AVAILABLE
 
 class BorrowingService:
     """Main service class that orchestrates all operations."""
@@ -40,7 +55,7 @@ class BorrowingService:
 
         loan = Loan(member, available_copy, checkout_date, due_date)
         self._loans[available_copy.copy_id] = loan
-        available_copy.status = BookStatus.LOANED
+        self._catalog.mark_loaned(available_copy)
 
         print(f"Book '{available_copy.book.title}' checked out to {member.name}. Due: {due_date}")
         return loan
@@ -52,7 +67,7 @@ class BorrowingService:
 
         loan = self._loans.pop(copy_id)
         book_copy = loan.book_copy
-        book_copy.status = BookStatus.AVAILABLE
+        self._catalog.mark_available(book_copy)
 
         print(f"Book '{book_copy.book.title}' returned by {loan.member.name}.")
 
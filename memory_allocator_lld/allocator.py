@@ -1,78 +1,6 @@
-from __future__ import annotations
-import struct
-from typing import Optional
-
 from strategy import AllocationStrategy, FirstFitStrategy
 from exceptions import OutOfMemoryException, InvalidPointerException
-
-# struct format for the block header: size (unsigned long long), is_free (bool)
-HEADER_FORMAT = "<Q?"
-HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
-
-# struct format for the free list pointers: next_ptr (Q), prev_ptr (Q)
-POINTER_FORMAT = "<QQ"
-POINTER_SIZE = struct.calcsize(POINTER_FORMAT)
-
-MIN_BLOCK_SIZE = HEADER_SIZE + POINTER_SIZE
-
-
-class _Block:
-    """A private helper class to provide an object-oriented view over a memory block."""
-
-    def __init__(self, memory: bytearray, ptr: int):
-        self.memory = memory
-        self.ptr = ptr  # Pointer to the start of the block (and its header)
-
-    @property
-    def header(self) -> tuple[int, bool]:
-        return struct.unpack_from(HEADER_FORMAT, self.memory, self.ptr)
-
-    @property
-    def size(self) -> int:
-        return self.header[0]
-
-    @size.setter
-    def size(self, value: int):
-        is_free = self.is_free
-        struct.pack_into(HEADER_FORMAT, self.memory, self.ptr, value, is_free)
-
-    @property
-    def is_free(self) -> bool:
-        return self.header[1]
-
-    @is_free.setter
-    def is_free(self, value: bool):
-        size = self.size
-        struct.pack_into(HEADER_FORMAT, self.memory, self.ptr, size, value)
-
-    @property
-    def data_ptr(self) -> int:
-        return self.ptr + HEADER_SIZE
-
-    def _get_free_pointers(self) -> tuple[int, int]:
-        return struct.unpack_from(POINTER_FORMAT, self.memory, self.data_ptr)
-
-    @property
-    def next_free_ptr(self) -> int:
-        return self._get_free_pointers()[0]
-
-    @property
-    def prev_free_ptr(self) -> int:
-        return self._get_free_pointers()[1]
-
-    @property
-    def next_free(self) -> Optional[_Block]:
-        ptr = self.next_free_ptr
-        return _Block(self.memory, ptr) if ptr != 0 else None
-
-    @property
-    def prev_free(self) -> Optional[_Block]:
-        ptr = self.prev_free_ptr
-        return _Block(self.memory, ptr) if ptr != 0 else None
-
-    def set_free_pointers(self, next_ptr: int, prev_ptr: int):
-        struct.pack_into(POINTER_FORMAT, self.memory,
-                         self.data_ptr, next_ptr, prev_ptr)
+from layout import FOOTER_SIZE, HEADER_SIZE, MIN_BLOCK_SIZE, NULL_PTR, _HEADER, _POINTERS
 
 
 class MemoryAllocator:
@@ -81,81 +9,98 @@ class MemoryAllocator:
             raise ValueError(f"Total size must be at least {MIN_BLOCK_SIZE}")
         self.memory = bytearray(total_size)
         self.strategy = strategy
-        self.free_list_head: Optional[_Block] = _Block(self.memory, 0)
-        self.free_list_head.size = total_size
-        self.free_list_head.is_free = True
-        self.free_list_head.set_free_pointers(0, 0)  # next=0, prev=0 (null)
+        # Segregated free lists: bins[k] is the head of the list of free blocks
+        # whose size lies in [2**k, 2**(k+1)), or NULL_PTR if there are none.
+        self.bins = [NULL_PTR] * total_size.bit_length()
+        self._write_tags(0, total_size, True)
+        self._add_to_free_list(0, total_size)
 
     def allocate(self, size: int) -> int:
         if size <= 0:
             raise ValueError("Allocation size must be positive.")
 
-        required_size = size + HEADER_SIZE
-        best_block = self.strategy.find(required_size, self.free_list_head)
+        # Once freed, the block must have room for its free list pointers.
+        required_size = max(size + HEADER_SIZE + FOOTER_SIZE, MIN_BLOCK_SIZE)
+        memory = self.memory
+        block_ptr = self.strategy.find(required_size, memory, self.bins)
 
-        if not best_block:
+        if block_ptr is None:
             raise OutOfMemoryException(f"Cannot allocate {size} bytes.")
 
-        # If the block is large enough, split it
-        if best_block.size >= required_size + MIN_BLOCK_SIZE:
-            new_block_ptr = best_block.ptr + required_size
-            new_block = _Block(self.memory, new_block_ptr)
-            new_block.size = best_block.size - required_size
-            new_block.is_free = True
-            self._add_to_free_list(new_block)
+        block_size = _HEADER.unpack_from(memory, block_ptr)[0]
+        self._remove_from_free_list(block_ptr, block_size)
 
-            best_block.size = required_size
+        # If the block is large enough, split it
+        if block_size >= required_size + MIN_BLOCK_SIZE:
+            new_block_ptr = block_ptr + required_size
+            self._write_tags(new_block_ptr, block_size - required_size, True)
+            self._add_to_free_list(new_block_ptr, block_size - required_size)
+            block_size = required_size
 
-        # Mark the block as allocated and remove from free list
-        best_block.is_free = False
-        self._remove_from_free_list(best_block)
+        # Mark the block as allocated
+        self._write_tags(block_ptr, block_size, False)
 
-        return best_block.data_ptr
+        return block_ptr + HEADER_SIZE
 
     def free(self, ptr: int):
         if ptr < HEADER_SIZE:
             raise InvalidPointerException("Invalid pointer provided.")
 
+        memory = self.memory
         block_ptr = ptr - HEADER_SIZE
-        block_to_free = _Block(self.memory, block_ptr)
+        block_size, is_free = _HEADER.unpack_from(memory, block_ptr)
 
-        if block_to_free.is_free:
+        if is_free:
             raise InvalidPointerException("Double free detected.")
 
-        block_to_free.is_free = True
-
         # Coalesce with next physical block
-        next_physical_block_ptr = block_to_free.ptr + block_to_free.size
-        if next_physical_block_ptr < len(self.memory):
-            next_block = _Block(self.memory, next_physical_block_ptr)
-            if next_block.is_free:
-                self._remove_from_free_list(next_block)
-                block_to_free.size += next_block.size
-
-        # Coalesce with previous physical block (more complex)
-        # This simplified version only adds the current block back.
-        # A full implementation would need to find the previous physical block.
-        self._add_to_free_list(block_to_free)
-
-    def _add_to_free_list(self, block: _Block):
-        # Add to the head of the list
-        next_head = self.free_list_head
-        if next_head:
-            block.set_free_pointers(next_head.ptr, 0)
-            next_head.set_free_pointers(next_head.next_free_ptr, block.ptr)
-        else:
-            block.set_free_pointers(0, 0)
-        self.free_list_head = block
-
-    def _remove_from_free_list(self, block: _Block):
-        prev_block, next_block = block.prev_free, block.next_free
-
-        if prev_block:
-            prev_block.set_free_pointers(
-                block.next_free_ptr, prev_block.prev_free_ptr)
+        next_physical_block_ptr = block_ptr + block_size
+        if next_physical_block_ptr < len(memory):
+            next_size, next_is_free = _HEADER.unpack_from(memory, next_physical_block_ptr)
+            if next_is_free:
+                self._remove_from_free_list(next_physical_block_ptr, next_size)
+                block_size += next_size
+
+        # Coalesce with previous physical block, found through its footer
+        if block_ptr > 0:
+            prev_size, prev_is_free = _HEADER.unpack_from(memory, block_ptr - FOOTER_SIZE)
+            if prev_is_free:
+                # Leave this block's own header marked free, so freeing the
+                # same pointer again is still caught once it is merged away.
+                _HEADER.pack_into(memory, block_ptr, block_size, True)
+                block_ptr -= prev_size
+                self._remove_from_free_list(block_ptr, prev_size)
+                block_size += prev_size
+
+        self._write_tags(block_ptr, block_size, True)
+        self._add_to_free_list(block_ptr, block_size)
+
+    def _write_tags(self, block_ptr: int, block_size: int, is_free: bool):
+        # The header and its boundary-tag copy at the end of the block
+        _HEADER.pack_into(self.memory, block_ptr, block_size, is_free)
+        _HEADER.pack_into(self.memory, block_ptr + block_size - FOOTER_SIZE, block_size, is_free)
+
+    def _add_to_free_list(self, block_ptr: int, block_size: int):
+        # Add to the head of the list for the block's size class
+        memory = self.memory
+        size_class = block_size.bit_length() - 1
+        head_ptr = self.bins[size_class]
+        _POINTERS.pack_into(memory, block_ptr + HEADER_SIZE, head_ptr, NULL_PTR)
+        if head_ptr != NULL_PTR:
+            head_next_ptr = _POINTERS.unpack_from(memory, head_ptr + HEADER_SIZE)[0]
+            _POINTERS.pack_into(memory, head_ptr + HEADER_SIZE, head_next_ptr, block_ptr)
+        self.bins[size_class] = block_ptr
+
+    def _remove_from_free_list(self, block_ptr: int, block_size: int):
+        memory = self.memory
+        next_ptr, prev_ptr = _POINTERS.unpack_from(memory, block_ptr + HEADER_SIZE)
+
+        if prev_ptr != NULL_PTR:
+            prev_prev_ptr = _POINTERS.unpack_from(memory, prev_ptr + HEADER_SIZE)[1]
+            _POINTERS.pack_into(memory, prev_ptr + HEADER_SIZE, next_ptr, prev_prev_ptr)
         else:  # It was the head
-            self.free_list_head = next_block
+            self.bins[block_size.bit_length() - 1] = next_ptr
 
-        if next_block:
-            next_block.set_free_pointers(
-                next_block.next_free_ptr, block.prev_free_ptr)
+        if next_ptr != NULL_PTR:
+            next_next_ptr = _POINTERS.unpack_from(memory, next_ptr + HEADER_SIZE)[0]
+            _POINTERS.pack_into(memory, next_ptr + HEADER_SIZE, next_next_ptr, prev_ptr)
@@ -0,0 +1,25 @@
+import struct
+
+# struct format for the block header: size (unsigned long long), is_free (bool)
+HEADER_FORMAT = "<Q?"
+# struct format for the free list pointers: next_ptr (Q), prev_ptr (Q)
+POINTER_FORMAT = "<QQ"
+
+# Compiled once, so header and pointer accesses skip the format lookup that
+# the module-level struct functions do on every call.
+_HEADER = struct.Struct(HEADER_FORMAT)
+_POINTERS = struct.Struct(POINTER_FORMAT)
+
+HEADER_SIZE = _HEADER.size
+POINTER_SIZE = _POINTERS.size
+
+# Boundary tag: every block ends with a copy of its header, so free() can read
+# the size and state of the previous physical block just before its own header.
+FOOTER_FORMAT = HEADER_FORMAT
+FOOTER_SIZE = HEADER_SIZE
+
+MIN_BLOCK_SIZE = HEADER_SIZE + POINTER_SIZE + FOOTER_SIZE
+
+# Free list pointer value meaning "no block". Offset 0 is the first block, so
+# it cannot double as the null pointer.
+NULL_PTR = 2**64 - 1
@@ -1,40 +1,79 @@
-from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Optional
+from typing import List, Optional
+
+from layout import HEADER_SIZE, NULL_PTR, _HEADER, _POINTERS
 
-if TYPE_CHECKING:
-    from allocator import _Block
 
 class AllocationStrategy(ABC):
     """Interface for different memory allocation strategies."""
 
     @abstractmethod
-    def find(self, size: int, free_list_head: Optional[_Block]) -> Optional[_Block]:
-        """Finds a suitable free block from the free list."""
+    def find(self, size: int, memory: bytearray, bins: List[int]) -> Optional[int]:
+        """
+        Finds a suitable free block and returns its offset. bins[k] heads the
+        free list of blocks whose size lies in [2**k, 2**(k+1)), so classes
+        below size.bit_length() - 1 never need to be looked at. The lists are
+        walked by reading sizes and next pointers straight out of memory,
+        without building an object per visited block.
+        """
         pass
 
 
 class FirstFitStrategy(AllocationStrategy):
-    """Scans the free list and chooses the first block that is large enough."""
-
-    def find(self, size: int, free_list_head: Optional[_Block]) -> Optional[_Block]:
-        current_block = free_list_head
-        while current_block:
-            if current_block.size >= size:
-                return current_block
-            current_block = current_block.next_free
+    """
+    Scans the free lists, smallest size class first, and chooses the first
+    block that is large enough. With segregated lists this is first fit
+    within a size class: a fitting block in a smaller class wins over a
+    lower-addressed or more recently freed one in a larger class.
+    """
+
+    def find(self, size: int, memory: bytearray, bins: List[int]) -> Optional[int]:
+        for ptr in bins[size.bit_length() - 1:]:
+            while ptr != NULL_PTR:
+                if _HEADER.unpack_from(memory, ptr)[0] >= size:
+                    return ptr
+                ptr = _POINTERS.unpack_from(memory, ptr + HEADER_SIZE)[0]
         return None
 
 
 class BestFitStrategy(AllocationStrategy):
-    """Scans the entire free list to find the smallest block that is large enough."""
-
-    def find(self, size: int, free_list_head: Optional[_Block]) -> Optional[_Block]:
-        best_block: Optional[_Block] = None
-        current_block = free_list_head
-        while current_block:
-            if current_block.size >= size:
-                if best_block is None or current_block.size < best_block.size:
-                    best_block = current_block
-            current_block = current_block.next_free
-        return best_block
+    """Scans the free lists to find the smallest block that is large enough."""
+
+    def find(self, size: int, memory: bytearray, bins: List[int]) -> Optional[int]:
+        for ptr in bins[size.bit_length() - 1:]:
+            best_ptr: Optional[int] = None
+            best_size = 0
+            while ptr != NULL_PTR:
+                block_size = _HEADER.unpack_from(memory, ptr)[0]
+                if block_size >= size and (best_ptr is None or block_size < best_size):
+                    if block_size == size:
+                        return ptr  # An exact fit cannot be beaten
+                    best_ptr, best_size = ptr, block_size
+                ptr = _POINTERS.unpack_from(memory, ptr + HEADER_SIZE)[0]
+            # Every block in a higher size class is larger than this one.
+            if best_ptr is not None:
+                return best_ptr
+        return None
+
+
+class SegregatedFitStrategy(AllocationStrategy):
+    """
+    Takes the head of the smallest size class whose blocks are all large
+    enough, so most allocations never walk a list. Only when those classes are
+    empty does it search the one class that may hold both smaller and larger
+    blocks.
+    """
+
+    def find(self, size: int, memory: bytearray, bins: List[int]) -> Optional[int]:
+        # Blocks in bins[k] are at least 2**k bytes: every one fits once 2**k >= size.
+        for ptr in bins[(size - 1).bit_length():]:
+            if ptr != NULL_PTR:
+                return ptr
+        size_class = size.bit_length() - 1
+        if size_class < len(bins):
+            ptr = bins[size_class]
+            while ptr != NULL_PTR:
+                if _HEADER.unpack_from(memory, ptr)[0] >= size:
+                    return ptr
+                ptr = _POINTERS.unpack_from(memory, ptr + HEADER_SIZE)[0]
+        return None
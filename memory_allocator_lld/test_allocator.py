@@ -0,0 +1,186 @@
+import random
+import unittest
+
+from allocator import MemoryAllocator
+from exceptions import InvalidPointerException, OutOfMemoryException
+from layout import FOOTER_SIZE, HEADER_SIZE, MIN_BLOCK_SIZE, NULL_PTR, _HEADER, _POINTERS
+from strategy import BestFitStrategy, FirstFitStrategy, SegregatedFitStrategy
+
+
+def block_size(size):
+    """Size of the block that allocate(size) carves out."""
+    return max(size + HEADER_SIZE + FOOTER_SIZE, MIN_BLOCK_SIZE)
+
+
+def physical_blocks(alloc):
+    """(offset, size, is_free) of every block, walking the heap in address order."""
+    blocks, ptr = [], 0
+    while ptr < len(alloc.memory):
+        size, is_free = _HEADER.unpack_from(alloc.memory, ptr)
+        blocks.append((ptr, size, is_free))
+        ptr += size
+    return blocks
+
+
+def free_list_blocks(alloc):
+    """Offsets on the free lists, with each list's back pointers checked."""
+    found = set()
+    for size_class, head in enumerate(alloc.bins):
+        prev, ptr = NULL_PTR, head
+        while ptr != NULL_PTR:
+            next_ptr, prev_ptr = _POINTERS.unpack_from(alloc.memory, ptr + HEADER_SIZE)
+            assert prev_ptr == prev, ("back pointer", ptr)
+            assert _HEADER.unpack_from(alloc.memory, ptr)[0].bit_length() - 1 == size_class, ("bin", ptr)
+            found.add(ptr)
+            prev, ptr = ptr, next_ptr
+    return found
+
+
+class AllocatorTestCase(unittest.TestCase):
+    def assertHeapConsistent(self, alloc):
+        blocks = physical_blocks(alloc)
+        self.assertEqual(sum(size for _, size, _ in blocks), len(alloc.memory))
+        for ptr, size, is_free in blocks:
+            # Boundary tag: the footer repeats the header
+            self.assertEqual(_HEADER.unpack_from(alloc.memory, ptr + size - FOOTER_SIZE), (size, is_free))
+        for (_, _, free1), (ptr2, _, free2) in zip(blocks, blocks[1:]):
+            self.assertFalse(free1 and free2, f"adjacent free blocks not merged at {ptr2}")
+        self.assertEqual(free_list_blocks(alloc), {ptr for ptr, _, is_free in blocks if is_free})
+
+
+class TestCoalescing(AllocatorTestCase):
+    def setUp(self):
+        # Exactly three 40-byte blocks, so no free tail sits next to them
+        self.alloc = MemoryAllocator(3 * block_size(40))
+        self.a, self.b, self.c = (self.alloc.allocate(40) for _ in range(3))
+        self.assertHeapConsistent(self.alloc)
+
+    def blocks(self):
+        return [(ptr, size, is_free) for ptr, size, is_free in physical_blocks(self.alloc)]
+
+    def test_merges_with_next_block(self):
+        self.alloc.free(self.b)
+        self.alloc.free(self.a)
+        self.assertEqual(self.blocks()[0], (0, 2 * block_size(40), True))
+        self.assertHeapConsistent(self.alloc)
+
+    def test_merges_with_previous_block(self):
+        self.alloc.free(self.a)
+        self.alloc.free(self.b)
+        self.assertEqual(self.blocks()[0], (0, 2 * block_size(40), True))
+        self.assertHeapConsistent(self.alloc)
+
+    def test_merges_with_both_neighbours(self):
+        self.alloc.free(self.a)
+        self.alloc.free(self.c)
+        self.alloc.free(self.b)
+        self.assertEqual(self.blocks(), [(0, 3 * block_size(40), True)])
+        self.assertHeapConsistent(self.alloc)
+        # The merged block can be handed out whole
+        self.assertEqual(self.alloc.allocate(3 * block_size(40) - HEADER_SIZE - FOOTER_SIZE), HEADER_SIZE)
+
+    def test_double_free_is_rejected(self):
+        self.alloc.free(self.b)
+        with self.assertRaises(InvalidPointerException):
+            self.alloc.free(self.b)
+
+    def test_double_free_after_merge_is_rejected(self):
+        for first, second in ((self.a, self.b), (self.b, self.a)):
+            alloc = MemoryAllocator(3 * block_size(40))
+            ptrs = {p: alloc.allocate(40) for p in (self.a, self.b, self.c)}
+            alloc.free(ptrs[first])
+            alloc.free(ptrs[second])
+            for ptr in (first, second):
+                with self.assertRaises(InvalidPointerException):
+                    alloc.free(ptrs[ptr])
+            self.assertHeapConsistent(alloc)
+
+    def test_invalid_pointer_is_rejected(self):
+        with self.assertRaises(InvalidPointerException):
+            self.alloc.free(0)
+
+
+class TestStrategies(AllocatorTestCase):
+    def setUp(self):
+        # Free blocks a (class 6), b (class 5) and c (class 7), kept apart by
+        # small allocated separators and with no free tail after them.
+        sizes = [100, 10, 40, 10, 200, 10]
+        self.alloc = MemoryAllocator(sum(map(block_size, sizes)))
+        ptrs = [self.alloc.allocate(size) for size in sizes]
+        self.a, self.b, self.c = (ptr - HEADER_SIZE for ptr in ptrs[0::2])
+        for ptr in ptrs[0::2]:
+            self.alloc.free(ptr)
+        self.assertHeapConsistent(self.alloc)
+
+    def find(self, strategy, size):
+        return strategy.find(size, self.alloc.memory, self.alloc.bins)
+
+    def test_first_fit(self):
+        strategy = FirstFitStrategy()
+        # Smallest size class first: b wins over the lower-addressed a
+        self.assertEqual(self.find(strategy, block_size(30)), self.b)
+        # b is too small for its own class's request, so the next class
+        self.assertEqual(self.find(strategy, block_size(45)), self.a)
+        self.assertEqual(self.find(strategy, block_size(150)), self.c)
+        self.assertIsNone(self.find(strategy, block_size(300)))
+
+    def test_best_fit(self):
+        strategy = BestFitStrategy()
+        self.assertEqual(self.find(strategy, block_size(30)), self.b)
+        self.assertEqual(self.find(strategy, block_size(100)), self.a)  # Exact fit
+        self.assertEqual(self.find(strategy, block_size(101)), self.c)
+        self.assertIsNone(self.find(strategy, block_size(300)))
+
+    def test_segregated_fit(self):
+        strategy = SegregatedFitStrategy()
+        # The head of the smallest class whose blocks all fit: a, not b
+        self.assertEqual(self.find(strategy, block_size(30)), self.a)
+        self.assertEqual(self.find(strategy, block_size(100)), self.c)
+        self.assertIsNone(self.find(strategy, block_size(300)))
+
+    def test_segregated_fit_searches_the_mixed_class_last(self):
+        strategy = SegregatedFitStrategy()
+        self.alloc.allocate(100)
+        self.alloc.allocate(200)
+        # Only b (58 bytes, class 5) is left: found by walking its class
+        self.assertEqual(self.find(strategy, block_size(30)), self.b)
+        self.assertIsNone(self.find(strategy, block_size(45)))
+
+    def test_allocate_uses_strategy(self):
+        for strategy, expected in ((FirstFitStrategy(), self.b), (SegregatedFitStrategy(), self.a)):
+            self.alloc.strategy = strategy
+            ptr = self.alloc.allocate(30)
+            self.assertEqual(ptr, expected + HEADER_SIZE)
+            self.alloc.free(ptr)
+            self.assertHeapConsistent(self.alloc)
+
+
+class TestRandomWorkload(AllocatorTestCase):
+    def test_heap_stays_consistent(self):
+        for strategy in (FirstFitStrategy(), BestFitStrategy(), SegregatedFitStrategy()):
+            rng = random.Random(7)
+            alloc = MemoryAllocator(4096, strategy)
+            live = {}
+            for step in range(2000):
+                if live and (rng.random() < 0.45 or len(live) > 40):
+                    ptr = rng.choice(list(live))
+                    # Contents survive until the block is freed
+                    self.assertEqual(bytes(alloc.memory[ptr:ptr + len(live[ptr])]), live.pop(ptr))
+                    alloc.free(ptr)
+                else:
+                    data = bytes([step % 256]) * rng.randint(1, 200)
+                    try:
+                        ptr = alloc.allocate(len(data))
+                    except OutOfMemoryException:
+                        continue
+                    alloc.memory[ptr:ptr + len(data)] = data
+                    live[ptr] = data
+                if step % 50 == 0:
+                    self.assertHeapConsistent(alloc)
+            for ptr in list(live):
+                alloc.free(ptr)
+            self.assertEqual(physical_blocks(alloc), [(0, 4096, True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,32 @@
 import os
 import json
 import csv
+import functools
 import hashlib
 import importlib.util
+import mmap
+import operator
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from unittest.mock import patch, mock_open
 
+try:
+    import xxhash
+except ImportError:  # Optional: only needed for fast_hash.
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:  # Optional: manifests fall back to the json module.
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional: only used to stream large JSON manifests.
+    ijson = None
+
 # =============================================================================
 # EXERCISE 1: SEQUENCING BACKUPS
 # =============================================================================
@@ -35,11 +55,22 @@ def get_next_manifest_name(directory, ext='csv'):
 # Reasoning: We inject the hashing function as a dependency. In production, 
 # we use 'our_hash'. In tests, we inject 'mock_hash'. This allows tests to be 
 # deterministic and fast without real file I/O.
+# Manifests do not record which hash made them, so the default must not
+# depend on what is installed: 'our_hash' is always SHA-256. Manifest hashes
+# only detect changes, so an archive can opt into 'fast_hash' (xxh128, many
+# times faster) by passing it everywhere; manifests that are compared or
+# restored must come from the same hash.
 
 def our_hash(data):
     """Real hashing using SHA-256."""
     return hashlib.sha256(data).hexdigest()
 
+def fast_hash(data):
+    """Real hashing using xxh128, for archives that opt into it. Needs xxhash."""
+    if xxhash is None:
+        raise ImportError("fast_hash requires the xxhash package")
+    return xxhash.xxh128_hexdigest(data)
+
 def mock_hash(data):
     """Predictable hash for testing: just the first 8 bytes."""
     return data[:8].decode('utf-8', errors='ignore').ljust(8, '0')
@@ -50,6 +81,20 @@ def mock_hash(data):
 # =============================================================================
 # Reasoning: The Manifest class encapsulates formatting. The migration logic 
 # handles schema updates (adding 'creator').
+# Manifest files are read and written through a 1 MiB buffer, so a large
+# manifest costs a handful of system calls instead of one per 8 KiB.
+# JSON manifests go through orjson when it is installed. It writes the same
+# indented layout as json.dumps(indent=2), except non-ASCII text is stored
+# as UTF-8 instead of \u escapes, so the json fallback reads them as UTF-8.
+
+_IO_BUFFER_SIZE = 1 << 20
+# JSON manifests at least this large are streamed (when ijson is available)
+# straight into the files dict, instead of holding the whole text and the
+# parsed document in memory at once.
+_STREAM_THRESHOLD = 1 << 20
+# Characters that make csv.writer quote a field. Manifests without any are
+# written as one joined string instead of a writerow() call per file.
+_CSV_UNSAFE = re.compile(r'[,"\r\n]')
 
 class Manifest:
     def __init__(self, creator=None):
@@ -61,33 +106,88 @@ class Manifest:
 
     def save(self, path, format='csv'):
         if format == 'csv':
-            with open(path, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['path', 'hash', 'creator'])
-                for p, h in self.files.items():
-                    writer.writerow([p, h, self.creator])
+            creator = self.creator
+            unsafe = _CSV_UNSAFE.search
+            needs_quoting = (unsafe(creator) or any(map(unsafe, self.files))
+                             or any(map(unsafe, self.files.values())))
+            with open(path, 'w', newline='', buffering=_IO_BUFFER_SIZE) as f:
+                if needs_quoting:
+                    writer = csv.writer(f)
+                    writer.writerow(['path', 'hash', 'creator'])
+                    for p, h in self.files.items():
+                        writer.writerow([p, h, creator])
+                else:
+                    # Same output as csv.writer, including its \r\n line ends
+                    f.write('path,hash,creator\r\n' + ''.join(
+                        f'{p},{h},{creator}\r\n' for p, h in self.files.items()))
         elif format == 'json':
             data = {'metadata': {'creator': self.creator}, 'files': self.files}
-            with open(path, 'w') as f:
-                json.dump(data, f, indent=2)
+            if orjson is not None:
+                with open(path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                return
+            with open(path, 'w', buffering=_IO_BUFFER_SIZE) as f:
+                # One write of the whole document; json.dump() would write
+                # each small encoder chunk separately.
+                f.write(json.dumps(data, indent=2))
 
     @classmethod
     def load(cls, path):
+        shared = _load_shared(path)
+        m = cls(creator=shared.creator)
+        m.files = dict(shared.files)  # The caller's own copy to modify
+        return m
+
+    @classmethod
+    def _load_uncached(cls, path):
         _, ext = os.path.splitext(path)
-        m = cls()
+        files, creator = {}, None
         if ext == '.csv':
-            with open(path, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    m.add(row['path'], row['hash'])
-                    m.creator = row.get('creator', 'unknown')
+            with open(path, 'r', newline='', buffering=_IO_BUFFER_SIZE) as f:
+                # Plain rows and column indexes instead of csv.DictReader's
+                # dict per row; the files dict is then built in C.
+                reader = csv.reader(f)
+                header = next(reader, [])
+                rows = list(filter(None, reader))  # Skip blank lines, like DictReader
+            if rows:
+                files = dict(map(operator.itemgetter(header.index('path'), header.index('hash')), rows))
+                creator = rows[-1][header.index('creator')] if 'creator' in header else 'unknown'
+        elif ext == '.json' and ijson is not None and os.path.getsize(path) >= _STREAM_THRESHOLD:
+            with open(path, 'rb', buffering=_IO_BUFFER_SIZE) as f:
+                files = dict(ijson.kvitems(f, 'files'))
+                f.seek(0)
+                # 'metadata' is written first, so this stops near the start.
+                metadata = next(ijson.items(f, 'metadata'), None)
+            if metadata is None:
+                raise KeyError('metadata')  # As data['metadata'] does below
+            creator = metadata['creator']
         elif ext == '.json':
-            with open(path, 'r') as f:
-                data = json.load(f)
-                m.files = data['files']
-                m.creator = data['metadata']['creator']
+            if orjson is not None:
+                with open(path, 'rb', buffering=_IO_BUFFER_SIZE) as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(path, 'r', encoding='utf-8', buffering=_IO_BUFFER_SIZE) as f:
+                    data = json.load(f)
+            files = data['files']
+            creator = data['metadata']['creator']
+        m = cls(creator=creator)
+        m.files = files
         return m
 
+# Manifests are immutable once written, so each file is parsed once per
+# (path, mtime, size): repeated comparisons and history queries reuse it.
+# Limit: a manifest rewritten in place at the same size within one mtime tick
+# (up to seconds on coarse-timestamp filesystems) keeps the stale parse until
+# its mtime changes; call _cached_load.cache_clear() after such a rewrite.
+@functools.lru_cache(maxsize=512)
+def _cached_load(abs_path, mtime_ns, size):
+    return Manifest._load_uncached(abs_path)
+
+def _load_shared(path):
+    """The cached Manifest for path. Shared between callers: do not modify it."""
+    st = os.stat(path)
+    return _cached_load(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
 def migrate_manifests(source_dir, target_format='json'):
     """
     Exercise 2.2 & 2.3: Converts CSV to JSON and ensures 'creator' is present.
@@ -104,31 +204,41 @@ def migrate_manifests(source_dir, target_format='json'):
 # EXERCISE 4: COMPARING MANIFESTS
 # =============================================================================
 # Reasoning: We use sets for fast membership testing and dicts to map 
-# hashes back to names for rename detection.
+# hashes back to names for rename detection. Both are only built once a
+# path turns out to be missing on the other side, so the common diff with
+# no renames, deletions or additions never builds them.
 
 def compare_manifests(path1, path2):
-    m1 = Manifest.load(path1)
-    m2 = Manifest.load(path2)
+    # Only read here, so the cached manifests are used without copying.
+    m1 = _load_shared(path1)
+    m2 = _load_shared(path2)
     
     results = {'changed': [], 'renamed': [], 'deleted': [], 'added': []}
     
     # name -> hash
     f1, f2 = m1.files, m2.files
-    # hash -> name
-    h1 = {v: k for k, v in f1.items()}
-    h2 = {v: k for k, v in f2.items()}
+    # hash -> name in f2, and the set of hashes in f1
+    h2 = None
+    hashes1 = None
 
     for path, hash_val in f1.items():
         if path in f2:
             if f2[path] != hash_val:
                 results['changed'].append(path)
-        elif hash_val in h2:
+            continue
+        if h2 is None:
+            h2 = {v: k for k, v in f2.items()}
+        if hash_val in h2:
             results['renamed'].append((path, h2[hash_val]))
         else:
             results['deleted'].append(path)
 
     for path, hash_val in f2.items():
-        if path not in f1 and hash_val not in h1:
+        if path in f1:
+            continue
+        if hashes1 is None:
+            hashes1 = frozenset(f1.values())
+        if hash_val not in hashes1:
             results['added'].append(path)
             
     return results
@@ -140,21 +250,54 @@ def compare_manifests(path1, path2):
 # Reasoning: To restore state efficiently, we calculate the delta. 
 # In this exercise, we assume the 'archive' has the files.
 
+def hash_file(path, hash_func=our_hash):
+    """Hashes a file through a read-only memory map instead of a bytes copy."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hash_func(b'')  # Empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return hash_func(data)
+
+def _walk_files(top):
+    """
+    Yields the path of every file under top, classified like os.walk (which
+    does not follow directory symlinks), but from os.scandir entries whose
+    type is known without another stat() per file. Like os.walk, directories
+    that cannot be listed (including a missing top) are skipped.
+    """
+    stack = [top]
+    while stack:
+        try:
+            scandir_it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with scandir_it as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    yield entry.path
+                elif not entry.is_symlink():
+                    stack.append(entry.path)
+
 def from_to(target_dir, manifest_path, hash_func=our_hash):
     manifest = Manifest.load(manifest_path)
-    # 1. Check existing
-    for root, _, files in os.walk(target_dir):
-        for f in files:
-            p = os.path.relpath(os.path.join(root, f), target_dir)
-            if p not in manifest.files:
-                os.remove(os.path.join(target_dir, p)) # Delete extra
+    # 1. Check existing: collect the extra files, then delete them in
+    # parallel, since each unlink is a blocking system call.
+    prefix_len = len(os.path.join(target_dir, ''))
+    to_delete = [path for path in _walk_files(target_dir) if path[prefix_len:] not in manifest.files]
+    if to_delete:
+        with ThreadPoolExecutor() as pool:
+            list(pool.map(os.unlink, to_delete)) # Delete extra
     
-    # 2. Add/Update
+    # 2. Add/Update: restore missing files and files whose content changed
+    created_dirs = set()
     for p, h in manifest.files.items():
         dest = os.path.join(target_dir, p)
-        if not os.path.exists(dest):
+        if not os.path.exists(dest) or hash_file(dest, hash_func) != h:
             # In real system: fetch from archive. Here: dummy write.
-            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            parent = os.path.dirname(dest)
+            if parent not in created_dirs:
+                os.makedirs(parent, exist_ok=True)
+                created_dirs.add(parent)
             with open(dest, 'w') as f: f.write("restored") 
 
 
@@ -162,13 +305,16 @@ def from_to(target_dir, manifest_path, hash_func=our_hash):
 # EXERCISE 6: FILE HISTORY
 # =============================================================================
 # Reasoning: Tracing a file requires linear search through the manifest 
-# timeline.
+# timeline. The directory is listed on every call: a listing and sort cost
+# little next to the manifests themselves, which are cached (see
+# _cached_load), and no cache key for the listing is reliable on filesystems
+# with coarse or skewed timestamps.
 
 def file_history(filename, manifest_dir):
     history = []
     manifests = sorted([f for f in os.listdir(manifest_dir) if f.endswith(('.csv', '.json'))])
     for m_file in manifests:
-        m = Manifest.load(os.path.join(manifest_dir, m_file))
+        m = _load_shared(os.path.join(manifest_dir, m_file))
         if filename in m.files:
             history.append((m_file, m.files[filename]))
     return history
@@ -9,26 +9,64 @@ This version includes a comprehensive set of solutions to the exercises presente
 in the chapter, demonstrating a deeper exploration of the concepts.
 """
 
+import sys
+
 
 # --- Environment Management ---
-def env_get(env_stack: list[dict], name: str):
-    for frame in reversed(env_stack):
-        if name in frame:
-            return frame[name]
-    raise NameError(f"Name '{name}' not found in environment.")
+_UNBOUND = object()  # Marks a name that a frame did not shadow, but added
+
+
+class EnvStack:
+    """
+    A stack of frames for dynamic scoping, kept flattened into a single dict.
+    Looking a name up is one dict lookup however deep the call stack is,
+    instead of a scan over every frame. Each frame records the values its
+    names shadowed, so popping it restores the frames below.
+    """
+
+    def __init__(self, global_frame: dict | None = None):
+        self.flat = dict(global_frame or {})
+        self._undo = [{}]  # Per frame: name -> shadowed value (or _UNBOUND)
+
+    def push(self, frame: dict):
+        flat = self.flat
+        undo = {name: flat.get(name, _UNBOUND) for name in frame}
+        flat.update(frame)
+        self._undo.append(undo)
+
+    def pop(self):
+        flat = self.flat
+        for name, old in self._undo.pop().items():
+            if old is _UNBOUND:
+                del flat[name]
+            else:
+                flat[name] = old
+
+    def set(self, name: str, value):
+        undo = self._undo[-1]
+        if name not in undo:
+            undo[name] = self.flat.get(name, _UNBOUND)
+        self.flat[name] = value
+
+
+def env_get(env_stack: EnvStack, name: str):
+    try:
+        return env_stack.flat[name]
+    except KeyError:
+        raise NameError(f"Name '{name}' not found in environment.") from None
 
 
-def env_set(env_stack: list[dict], name: str, value):
-    env_stack[-1][name] = value
+def env_set(env_stack: EnvStack, name: str, value):
+    env_stack.set(name, value)
 
 
 # --- Function Definition and Call Handlers ---
-def _do_func_handler(env_stack: list[dict], args: list):
+def _do_func_handler(env_stack: EnvStack, args: list):
     assert len(args) == 2, "func expects 2 arguments: [params_list, body_expr]"
     return ["func", args[0], args[1]]
 
 
-def _do_call_handler(env_stack: list[dict], args: list):
+def _do_call_handler(env_stack: EnvStack, args: list):
     """
     Handles the "call" operation.
     (Exercise Solution for loop-based frame creation is implemented here).
@@ -53,7 +91,7 @@ def _do_call_handler(env_stack: list[dict], args: list):
     new_frame = {}
     for i in range(len(params)):
         new_frame[params[i]] = values[i]
-    env_stack.append(new_frame)
+    env_stack.push(new_frame)
 
     result = do(env_stack, body)
     env_stack.pop()
@@ -61,7 +99,7 @@ def _do_call_handler(env_stack: list[dict], args: list):
 
 
 # --- Main Interpreter Loop (Dynamic Scoping) ---
-def do(env_stack: list[dict], expr):
+def do(env_stack: EnvStack, expr):
     if not isinstance(expr, list):
         return expr
     op, *args = expr
@@ -93,6 +131,85 @@ def do(env_stack: list[dict], expr):
     raise ValueError(f"Unknown operation: {op}")
 
 
+# --- Compiled Interpreter (Dynamic Scoping) ---
+def compile_expr(expr):
+    """
+    Compiles an expression once into nested closures that each take the
+    environment, so running a program is `compile_expr(program)(env_stack)`
+    and no longer dispatches on the operation name at every step. Names are
+    interned, so environment lookups usually match by identity. Functions
+    defined by compiled code hold compiled bodies, so they must also be
+    called from compiled code.
+    """
+    if not isinstance(expr, list):
+        return lambda env_stack: expr
+    op, *args = expr
+    if op == "func":
+        assert len(args) == 2, "func expects 2 arguments: [params_list, body_expr]"
+        params = [sys.intern(param) for param in args[0]]
+        body = compile_expr(args[1])
+        return lambda env_stack: ["func", params, body]
+    if op == "call":
+        return _compile_call(args)
+    if op == "set":
+        name = sys.intern(args[0])
+        value = compile_expr(args[1])
+        return lambda env_stack: env_stack.set(name, value(env_stack))
+    if op == "get":
+        name = sys.intern(args[0])
+        return lambda env_stack: env_get(env_stack, name)
+    if op == "add":
+        left, right = compile_expr(args[0]), compile_expr(args[1])
+        return lambda env_stack: left(env_stack) + right(env_stack)
+    if op == "print":
+        value = compile_expr(args[0])
+        return lambda env_stack: print(value(env_stack))
+    if op == "seq":
+        parts = [compile_expr(sub_expr) for sub_expr in args]
+
+        def _seq(env_stack):
+            result = None
+            for part in parts:
+                result = part(env_stack)
+            return result
+
+        return _seq
+    if op == "repeat":
+        count, body = compile_expr(args[0]), compile_expr(args[1])
+
+        def _repeat(env_stack):
+            result = None
+            for _ in range(count(env_stack)):
+                result = body(env_stack)
+            return result
+
+        return _repeat
+    raise ValueError(f"Unknown operation: {op}")
+
+
+def _compile_call(args: list):
+    assert len(args) >= 1, "call expects at least 1 argument"
+    name = sys.intern(args[0])
+    arg_fns = [compile_expr(a) for a in args[1:]]
+
+    def _call(env_stack):
+        values = [arg_fn(env_stack) for arg_fn in arg_fns]
+        func = env_get(env_stack, name)
+        assert isinstance(func, list) and (
+            func[0] == "func"
+        ), f"'{name}' is not a function."
+        params, body = func[1], func[2]
+        assert len(values) == len(
+            params
+        ), f"Function '{name}' expected {len(params)} arguments, but got {len(values)}."
+        env_stack.push(dict(zip(params, values)))
+        result = body(env_stack)
+        env_stack.pop()
+        return result
+
+    return _call
+
+
 # --- Base Example Program ---
 example_program = [
     "seq",
@@ -394,7 +511,7 @@ if __name__ == "__main__":
 
     # Expected output: 2, 4, 8, 16
 
-    do([{}], example_program)
+    do(EnvStack(), example_program)
 
     print("--- Base Program Finished ---\n")
 
@@ -422,7 +539,7 @@ if __name__ == "__main__":
 
     try:
 
-        do([{}], arity_mismatch_program)
+        do(EnvStack(), arity_mismatch_program)
 
     except AssertionError as e:
 
@@ -571,3 +688,15 @@ if __name__ == "__main__":
     assert final_result_implicit == 16
 
     print("  Implicit sequence test successful.\n")
+
+    # 6. Compiled Interpreter
+
+    print("6. Compiled Interpreter Test:")
+
+    # The base example program, compiled once into closures and then run.
+
+    # Expected output: the same 2, 4, 8, 16 as the tree-walking `do`.
+
+    compile_expr(example_program)(EnvStack())
+
+    print("  Compiled program test successful.\n")
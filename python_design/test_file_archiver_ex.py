@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import file_archiver_ex
+from file_archiver_ex import (
+    _STREAM_THRESHOLD,
+    Manifest,
+    _load_shared,
+    file_history,
+    from_to,
+    hash_file,
+    our_hash,
+)
+
+
+class ArchiverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def write(self, rel_path, data):
+        path = os.path.join(self.tmp, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def read(self, rel_path):
+        with open(os.path.join(self.tmp, rel_path), 'rb') as f:
+            return f.read()
+
+    def save(self, path, files, format):
+        manifest = Manifest(creator='tester')
+        for p, h in files.items():
+            manifest.add(p, h)
+        manifest.save(path, format=format)
+
+
+class TestManifestCache(ArchiverTestCase):
+    def test_load_sees_rewritten_manifest(self):
+        for format in ('csv', 'json'):
+            path = os.path.join(self.tmp, 'manifest.' + format)
+            self.save(path, {'a.txt': 'h1'}, format)
+            self.assertEqual(Manifest.load(path).files, {'a.txt': 'h1'})
+
+            # Different size
+            self.save(path, {'a.txt': 'h1', 'b.txt': 'h2'}, format)
+            self.assertEqual(Manifest.load(path).files, {'a.txt': 'h1', 'b.txt': 'h2'})
+
+            # Same size: move the mtime a second on, as a later rewrite would,
+            # so the test does not depend on the filesystem's timestamp tick.
+            self.save(path, {'a.txt': 'h1', 'b.txt': 'h3'}, format)
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            self.assertEqual(Manifest.load(path).files, {'a.txt': 'h1', 'b.txt': 'h3'})
+
+    def test_load_returns_a_private_copy(self):
+        path = os.path.join(self.tmp, 'manifest.json')
+        self.save(path, {'a.txt': 'h1'}, 'json')
+        loaded = Manifest.load(path)
+        loaded.files['b.txt'] = 'h2'
+        loaded.files['a.txt'] = 'changed'
+        self.assertEqual(_load_shared(path).files, {'a.txt': 'h1'})
+        self.assertEqual(Manifest.load(path).files, {'a.txt': 'h1'})
+
+
+class TestJsonManifestLoad(ArchiverTestCase):
+    def write_json(self, name, data):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def large_files(self):
+        # Enough entries to take the manifest past the streaming threshold
+        return {f'src/pkg{i % 50}/module_{i}.py': our_hash(str(i).encode()) for i in range(20000)}
+
+    def test_missing_metadata(self):
+        path = self.write_json('small.json', {'files': {'a.txt': 'h1'}})
+        with self.assertRaises(KeyError):
+            Manifest.load(path)
+
+    @unittest.skipIf(file_archiver_ex.ijson is None, "ijson is not installed")
+    def test_streamed_load_matches_json_load(self):
+        path = os.path.join(self.tmp, 'large.json')
+        self.save(path, self.large_files(), 'json')
+        self.assertGreaterEqual(os.path.getsize(path), _STREAM_THRESHOLD)
+        with open(path) as f:
+            expected = json.load(f)
+        loaded = Manifest.load(path)
+        self.assertEqual(loaded.files, expected['files'])
+        self.assertEqual(loaded.creator, expected['metadata']['creator'])
+
+    @unittest.skipIf(file_archiver_ex.ijson is None, "ijson is not installed")
+    def test_streamed_load_missing_metadata(self):
+        path = self.write_json('large.json', {'files': self.large_files()})
+        self.assertGreaterEqual(os.path.getsize(path), _STREAM_THRESHOLD)
+        with self.assertRaises(KeyError):
+            Manifest.load(path)
+
+
+class TestFileHistory(ArchiverTestCase):
+    def test_history_in_manifest_order(self):
+        self.save(os.path.join(self.tmp, '00000001.csv'), {'a.txt': 'h1'}, 'csv')
+        self.save(os.path.join(self.tmp, '00000002.json'), {'b.txt': 'h2'}, 'json')
+        self.save(os.path.join(self.tmp, '00000003.csv'), {'a.txt': 'h3'}, 'csv')
+        self.assertEqual(file_history('a.txt', self.tmp),
+                         [('00000001.csv', 'h1'), ('00000003.csv', 'h3')])
+
+    def test_new_manifest_is_seen(self):
+        self.save(os.path.join(self.tmp, '00000001.csv'), {'a.txt': 'h1'}, 'csv')
+        self.assertEqual(file_history('a.txt', self.tmp), [('00000001.csv', 'h1')])
+        self.save(os.path.join(self.tmp, '00000002.csv'), {'a.txt': 'h2'}, 'csv')
+        self.assertEqual(file_history('a.txt', self.tmp),
+                         [('00000001.csv', 'h1'), ('00000002.csv', 'h2')])
+
+    def test_new_manifest_is_seen_in_old_directory(self):
+        # A directory last changed long ago, as one that a cached listing
+        # keyed on its mtime would have been trusted for.
+        self.save(os.path.join(self.tmp, '00000001.csv'), {'a.txt': 'h1'}, 'csv')
+        old = time.time_ns() - 60 * 10**9
+        os.utime(self.tmp, ns=(old, old))
+        self.assertEqual(file_history('a.txt', self.tmp), [('00000001.csv', 'h1')])
+        self.save(os.path.join(self.tmp, '00000002.csv'), {'a.txt': 'h2'}, 'csv')
+        self.assertEqual(file_history('a.txt', self.tmp),
+                         [('00000001.csv', 'h1'), ('00000002.csv', 'h2')])
+
+
+class TestHashFile(ArchiverTestCase):
+    def test_matches_hash_of_contents(self):
+        path = self.write('data.bin', b'some file contents')
+        self.assertEqual(hash_file(path), our_hash(b'some file contents'))
+
+    def test_default_hash_is_sha256(self):
+        # Independent of whether xxhash is installed, so manifests built on
+        # different machines agree.
+        path = self.write('data.bin', b'abc')
+        self.assertEqual(hash_file(path), hashlib.sha256(b'abc').hexdigest())
+
+    def test_empty_file(self):
+        # Zero-length files cannot be memory mapped
+        path = self.write('empty.txt', b'')
+        self.assertEqual(hash_file(path), our_hash(b''))
+
+
+class TestFromTo(ArchiverTestCase):
+    def restore(self, files):
+        manifest_path = os.path.join(self.tmp, 'manifest.json')
+        self.save(manifest_path, files, 'json')
+        from_to(os.path.join(self.tmp, 'target'), manifest_path)
+
+    def test_unchanged_file_is_left_alone(self):
+        path = self.write('target/same.txt', b'keep me')
+        mtime = os.stat(path).st_mtime_ns
+        self.restore({'same.txt': our_hash(b'keep me')})
+        self.assertEqual(self.read('target/same.txt'), b'keep me')
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+
+    def test_unchanged_empty_file_is_left_alone(self):
+        self.write('target/empty.txt', b'')
+        self.restore({'empty.txt': our_hash(b'')})
+        self.assertEqual(self.read('target/empty.txt'), b'')
+
+    def test_modified_file_is_restored(self):
+        self.write('target/sub/changed.txt', b'local edit')
+        self.restore({'sub/changed.txt': our_hash(b'archived version')})
+        self.assertEqual(self.read('target/sub/changed.txt'), b'restored')
+
+    def test_missing_target_dir_is_created(self):
+        self.restore({'new/f.txt': our_hash(b'archived version')})
+        self.assertEqual(self.read('target/new/f.txt'), b'restored')
+
+    def test_missing_and_extra_files(self):
+        self.write('target/extra.txt', b'not in the manifest')
+        self.restore({'new/missing.txt': our_hash(b'archived version')})
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, 'target/extra.txt')))
+        self.assertEqual(self.read('target/new/missing.txt'), b'restored')
+
+
+if __name__ == '__main__':
+    unittest.main()